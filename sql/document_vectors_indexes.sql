@@ -0,0 +1,24 @@
+-- Indexes and columns for the generic document_vectors table
+-- Apply to existing databases; new databases get them from the SQLAlchemy models
+
+-- Conflict target for the vectorization UPSERT (one row per source chunk)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_document_vectors_source_chunk
+    ON document_vectors (source_table, source_id, chunk_index);
+
+-- Approximate nearest-neighbour index for cosine similarity search
+-- (requires pgvector >= 0.7; the model declares embedding as a plain column).
+-- Embeddings are stored at full precision but indexed as halfvec, which halves
+-- the index size and the memory touched per search. The dimension must match
+-- EMBEDDING_DIMENSION, and queries must use the same expression to hit it.
+DROP INDEX IF EXISTS idx_document_vectors_embedding_hnsw;
+CREATE INDEX IF NOT EXISTS idx_document_vectors_embedding_halfvec_hnsw
+    ON document_vectors USING hnsw ((embedding::halfvec(768)) halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Metadata filters in similarity search use JSONB containment (@>)
+CREATE INDEX IF NOT EXISTS idx_document_vectors_metadata_gin
+    ON document_vectors USING gin (metadata jsonb_path_ops);
+
+-- Digest of chunk_text; vectorization skips chunks whose hash is unchanged.
+-- Left nullable so existing rows (re-embedded on their next run) stay valid.
+ALTER TABLE document_vectors ADD COLUMN IF NOT EXISTS content_hash bytea;
@@ -182,10 +182,13 @@ async def create_crew_job(
 @app.get("/crew_job/{job_id}")
 async def get_job_status(
     job_id: str,
+    status_only: bool = False,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """
     Get job status and results.
+    
+    Pass status_only=true to omit the result and events, e.g. while polling.
     """
     # Verify authentication
     try:
@@ -200,7 +203,9 @@ async def get_job_status(
         raise HTTPException(status_code=401, detail="Invalid authentication token")
     
     try:
-        job_status = await job_service.get_job_status(job_id)
+        job_status = await job_service.get_job_status(
+            job_id, include_details=not status_only
+        )
         if job_status is None:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -635,6 +640,20 @@ async def startup_event():
     await chat_controller.initialize()
     logger.info("Chat controller initialized")
     
+    # Pre-compile crew request validators so first requests skip compilation
+    try:
+        from services.json_validator import validator
+        await validator.warm_cache()
+    except Exception as e:
+        logger.warning(f"Schema validator warm-up skipped: {e}")
+    
+    # Load the chunking tokenizer now so the first vectorize request doesn't wait on it
+    try:
+        from services.vectorization_service import load_tokenizer
+        await load_tokenizer()
+    except Exception as e:
+        logger.warning(f"Tokenizer warm-up skipped: {e}")
+    
     # Log feature flag status
     from services.feature_flags import get_feature_flags
     feature_flags = get_feature_flags()
@@ -44,8 +44,8 @@ class ChatController:
             thinking_client=self.thinking_client
         )
         
-        # HTTP client for crew API
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # HTTP client for crew API; HTTP/2 lets concurrent calls share one connection
+        self.http_client = httpx.AsyncClient(timeout=30.0, http2=True)
         
         self._initialized = False
         
@@ -66,6 +66,7 @@ class ChatController:
         try:
             await self.session_store.disconnect()
             await self.http_client.aclose()
+            await self.memory_client.close()
             logger.info("ChatController shutdown complete")
         except Exception as e:
             logger.error(f"Error during ChatController shutdown: {e}")
@@ -97,6 +97,7 @@ async def lifespan(app: FastAPI):
     try:
         if chat_processor and chat_processor.session_manager:
             await chat_processor.session_manager.close()
+        await memory_client.close()
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
 
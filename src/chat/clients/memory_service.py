@@ -6,18 +6,37 @@ entity search, retrieval, and UPSERT operations with hierarchical
 SYNTH context resolution.
 """
 
+import asyncio
 import logging
+from functools import partial
+from itertools import chain
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 
 import httpx
+import orjson
+from cachetools import TTLCache
 from httpx import AsyncClient, HTTPStatusError, ConnectError, TimeoutException
+from pydantic import TypeAdapter
 
 from src.chat.models.context_models import SynthContext, MemoryEntity
 from src.chat.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Bucket index per hierarchy_level; anything else is an individual SYNTH memory
+_HIERARCHY_RANKS = {"client": 0, "company": 1, "synth_class": 2}
+_SYNTH_RANK = 3
+
+# Validates a whole result list in one pydantic-core call
+_MEMORY_ENTITY_LIST = TypeAdapter(List[MemoryEntity])
+
+# Upper bound on concurrent requests issued by search_many
+_MAX_PARALLEL_SEARCHES = 8
+
+# POST endpoints that only read; any other non-GET request writes entities
+_READ_ONLY_ENDPOINTS = frozenset({"/memory/search", "/memory/nodes"})
+
 
 class MemoryServiceError(Exception):
     """Base exception for memory service errors."""
@@ -37,7 +56,47 @@ class MemoryServiceClient:
         settings = get_settings()
         self.base_url = base_url or settings.memory_service_url
         self.timeout = httpx.Timeout(30.0, connect=5.0)
+        self.limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
         self.max_retries = 3
+        self._client: Optional[AsyncClient] = None
+        
+        # Recent search results; dropped for a scope whenever this client writes to it
+        self._search_cache: TTLCache = TTLCache(
+            maxsize=1024,
+            ttl=settings.memory_cache_ttl_minutes * 60
+        )
+        # Resolved SYNTH contexts by (actor_id, client_id)
+        self._synth_context_cache: TTLCache = TTLCache(
+            maxsize=1024,
+            ttl=settings.synth_context_cache_ttl_minutes * 60
+        )
+        # Searches currently in flight, shared by concurrent identical calls
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        # Bumped by invalidation so searches started before a write don't cache
+        # their result; global for unscoped writes, otherwise per client
+        self._generation = 0
+        self._client_generations: Dict[str, int] = {}
+        
+    def _get_client(self) -> AsyncClient:
+        """
+        Get the pooled HTTP client, creating it on first use.
+        
+        Requests share keep-alive connections instead of paying a new
+        TCP/TLS handshake per call.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=True
+            )
+        return self._client
+        
+    async def close(self) -> None:
+        """Close pooled connections to the memory service."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         
     async def _make_request(
         self,
@@ -81,17 +140,27 @@ class MemoryServiceClient:
             
         url = f"{self.base_url}{endpoint}"
         
+        # Encode the body once with orjson rather than per attempt with stdlib json
+        content = None
+        headers = None
+        if json_data is not None:
+            content = orjson.dumps(json_data)
+            headers = {"Content-Type": "application/json"}
+        
         for attempt in range(self.max_retries):
             try:
-                async with AsyncClient(timeout=self.timeout) as client:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        json=json_data,
-                        params=params
-                    )
-                    response.raise_for_status()
-                    return response.json()
+                response = await self._get_client().request(
+                    method=method,
+                    url=url,
+                    content=content,
+                    headers=headers,
+                    params=params
+                )
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+                if method.upper() != "GET" and endpoint not in _READ_ONLY_ENDPOINTS:
+                    self._invalidate_caches(client_id, actor_type, actor_id)
+                return result
                     
             except ConnectError as e:
                 logger.error(f"Failed to connect to memory service: {e}")
@@ -113,6 +182,56 @@ class MemoryServiceClient:
                 logger.error(f"Unexpected error calling memory service: {e}")
                 raise MemoryServiceError(f"Unexpected error: {e}")
                 
+    def _invalidate_caches(
+        self,
+        client_id: Optional[UUID],
+        actor_type: Optional[str],
+        actor_id: Optional[UUID]
+    ) -> None:
+        """
+        Drop cached searches and SYNTH contexts that a write may have made stale.
+        
+        A SYNTH writing its own memories only affects that SYNTH. Client or
+        class level writes change what every SYNTH of the client sees, and a
+        write with no client context could touch anyone.
+        
+        Args:
+            client_id: Client user ID the write was made for
+            actor_type: Actor type the write was made as
+            actor_id: Actor ID the write was made as
+        """
+        if client_id is None:
+            scope = None
+            self._generation += 1
+        else:
+            if actor_type == "synth" and actor_id is not None:
+                scope = (str(client_id), str(actor_id))
+            else:
+                scope = (str(client_id),)
+            self._client_generations[scope[0]] = self._client_generations.get(scope[0], 0) + 1
+            
+        def in_scope(entry_client_id: Any, entry_synth_id: Any) -> bool:
+            if scope is None:
+                return True
+            return (str(entry_client_id), str(entry_synth_id))[:len(scope)] == scope
+            
+        for key in [key for key in self._search_cache if in_scope(key[0], key[1])]:
+            self._search_cache.pop(key, None)
+        for key in [key for key in self._inflight if in_scope(key[0], key[1])]:
+            del self._inflight[key]
+        # SYNTH contexts are keyed (actor_id, client_id)
+        for key in [key for key in self._synth_context_cache if in_scope(key[1], key[0])]:
+            self._synth_context_cache.pop(key, None)
+            
+    def _cache_generation(self, client_id: UUID) -> tuple:
+        """Snapshot the invalidation counters that cover a client's searches."""
+        return (self._generation, self._client_generations.get(str(client_id), 0))
+        
+    def _forget_inflight(self, cache_key: tuple, future: asyncio.Future) -> None:
+        """Drop a finished search unless a newer one took its key after invalidation."""
+        if self._inflight.get(cache_key) is future:
+            del self._inflight[cache_key]
+            
     async def search_relevant_memories(
         self,
         query: str,
@@ -139,7 +258,57 @@ class MemoryServiceClient:
             include_client: Include client-level memories
             
         Returns:
-            List of memory entities sorted by relevance and hierarchy
+            List of memory entities sorted by relevance and hierarchy.
+            Results are cached per query and context for the memory cache
+            TTL, until this client writes entities for the same SYNTH or
+            client.
+        """
+        cache_key = (
+            synth_context.client_id,
+            synth_context.synth_id,
+            query,
+            tuple(synth_context.memory_access_scope or ()),
+            limit,
+            min_confidence,
+            include_synth_class,
+            include_client
+        )
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Memory search cache hit for query: {query[:50]}")
+            return list(cached)
+            
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_memories(
+                cache_key,
+                self._cache_generation(synth_context.client_id),
+                query,
+                synth_context,
+                limit,
+                min_confidence
+            ))
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(partial(self._forget_inflight, cache_key))
+            
+        # Shielded so one caller's cancellation doesn't abort the search for the rest
+        memories = await asyncio.shield(inflight)
+        return list(memories)
+        
+    async def _fetch_memories(
+        self,
+        cache_key: tuple,
+        generation: tuple,
+        query: str,
+        synth_context: SynthContext,
+        limit: int,
+        min_confidence: float
+    ) -> List[MemoryEntity]:
+        """
+        Run one memory search against the service and cache the layered result.
+        
+        The result is only cached if no write for the client was seen since
+        the search started, as it may predate that write.
         """
         try:
             # Prepare search request
@@ -168,12 +337,12 @@ class MemoryServiceClient:
             )
             
             # Convert to MemoryEntity objects
-            memories = []
-            for result in results:
-                memories.append(MemoryEntity(**result))
+            memories = _MEMORY_ENTITY_LIST.validate_python(results)
                 
             # Apply hierarchy layering and conflict resolution
             memories = self._apply_hierarchy_precedence(memories, synth_context)
+            if self._cache_generation(synth_context.client_id) == generation:
+                self._search_cache[cache_key] = memories
             
             logger.info(f"Found {len(memories)} relevant memories for query: {query}")
             return memories
@@ -184,6 +353,40 @@ class MemoryServiceClient:
             logger.error(f"Error searching memories: {e}")
             raise MemoryServiceError(f"Failed to search memories: {e}")
             
+    async def search_many(
+        self,
+        queries: List[Dict[str, Any]],
+        synth_context: SynthContext
+    ) -> List[List[MemoryEntity]]:
+        """
+        Run several memory searches concurrently.
+        
+        N independent searches cost about one round trip instead of N.
+        At most _MAX_PARALLEL_SEARCHES run at once so large batches don't
+        flood the memory service.
+        
+        Args:
+            queries: Keyword arguments for search_relevant_memories, one dict
+                per search (query, limit, min_confidence, ...)
+            synth_context: SYNTH context shared by all searches
+            
+        Returns:
+            One list of memory entities per query, in input order
+            
+        Raises:
+            MemoryServiceError: If any of the searches fails
+        """
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_SEARCHES)
+        
+        async def bounded_search(query: Dict[str, Any]) -> List[MemoryEntity]:
+            async with semaphore:
+                return await self.search_relevant_memories(
+                    synth_context=synth_context, **query
+                )
+                
+        results = await asyncio.gather(*(bounded_search(query) for query in queries))
+        return list(results)
+            
     async def get_entities_by_names(
         self,
         names: List[str],
@@ -211,11 +414,7 @@ class MemoryServiceClient:
                 actor_id=synth_context.synth_id
             )
             
-            entities = []
-            for result in results:
-                entities.append(MemoryEntity(**result))
-                
-            return entities
+            return _MEMORY_ENTITY_LIST.validate_python(results)
             
         except MemoryServiceError:
             raise
@@ -238,6 +437,10 @@ class MemoryServiceClient:
         Returns:
             List of created/updated entities
         """
+        # Nothing to write, so skip the round-trip and keep the caches warm
+        if not entities:
+            return []
+
         try:
             results = await self._make_request(
                 method="POST",
@@ -248,10 +451,8 @@ class MemoryServiceClient:
                 actor_id=synth_context.synth_id
             )
             
-            upserted = []
-            for result in results:
-                upserted.append(MemoryEntity(**result))
-                
+            upserted = _MEMORY_ENTITY_LIST.validate_python(results)
+            
             logger.info(f"Upserted {len(upserted)} entities")
             return upserted
             
@@ -280,8 +481,15 @@ class MemoryServiceClient:
             client_id: Client user ID
             
         Returns:
-            Resolved SYNTH context or None if not found
+            Resolved SYNTH context or None if not found. Resolved contexts
+            are cached for the SYNTH context cache TTL.
         """
+        cache_key = (actor_id, client_id)
+        cached = self._synth_context_cache.get(cache_key)
+        if cached is not None:
+            return cached
+            
+        generation = self._cache_generation(client_id)
         try:
             # Get SYNTH entity details
             synth_entities = await self.get_entities_by_names(
@@ -309,7 +517,7 @@ class MemoryServiceClient:
             # TODO: Query for synth_class config, company customizations, and client policies
             # This would require additional endpoints or a dedicated context resolution endpoint
             
-            return SynthContext(
+            synth_context = SynthContext(
                 synth_id=actor_id,
                 synth_class_id=synth_class_id,
                 client_id=client_id,
@@ -318,6 +526,9 @@ class MemoryServiceClient:
                 client_policies=synth_entity.metadata.get("client_policies", {}),
                 memory_access_scope=synth_entity.metadata.get("memory_access_scope", [])
             )
+            if self._cache_generation(client_id) == generation:
+                self._synth_context_cache[cache_key] = synth_context
+            return synth_context
             
         except Exception as e:
             logger.error(f"Error resolving SYNTH context: {e}")
@@ -345,37 +556,15 @@ class MemoryServiceClient:
             Memories sorted by precedence with conflicts resolved
         """
         # Group memories by hierarchy level
-        client_memories = []
-        company_memories = []
-        class_memories = []
-        synth_memories = []
+        buckets: List[List[MemoryEntity]] = [[] for _ in range(_SYNTH_RANK + 1)]
         
         for memory in memories:
-            # Determine hierarchy level from metadata
-            if memory.metadata.get("hierarchy_level") == "client":
-                client_memories.append(memory)
-            elif memory.metadata.get("hierarchy_level") == "company":
-                company_memories.append(memory)
-            elif memory.metadata.get("hierarchy_level") == "synth_class":
-                class_memories.append(memory)
-            else:
-                synth_memories.append(memory)
+            level = memory.metadata.get("hierarchy_level")
+            buckets[_HIERARCHY_RANKS.get(level, _SYNTH_RANK)].append(memory)
                 
-        # Combine in precedence order
-        layered_memories = (
-            client_memories +
-            company_memories +
-            class_memories +
-            synth_memories
-        )
-        
-        # Remove duplicates keeping highest precedence
-        seen_entities = set()
-        deduplicated = []
-        
-        for memory in layered_memories:
-            if memory.entity_name not in seen_entities:
-                seen_entities.add(memory.entity_name)
-                deduplicated.append(memory)
+        # Walk buckets in precedence order, keeping the first of each entity
+        deduplicated: Dict[str, MemoryEntity] = {}
+        for memory in chain.from_iterable(buckets):
+            deduplicated.setdefault(memory.entity_name, memory)
                 
-        return deduplicated
+        return list(deduplicated.values())
@@ -154,8 +154,9 @@ def create_conversation_entity(
     
     KISS: Simple factory function instead of complex builders.
     """
-    timestamp = int(datetime.utcnow().timestamp())
-    entity_name = f"conv_{str(session_id)[:8]}_{timestamp}"
+    # One clock read shared by the entity name, metadata and observation
+    now = datetime.utcnow()
+    entity_name = f"conv_{str(session_id)[:8]}_{int(now.timestamp())}"
     
     return ConversationEntity(
         actor_type="synth",
@@ -168,7 +169,7 @@ def create_conversation_entity(
                 "mode": mode,
                 "participant": str(participant_id),
                 "topic": topic or "general",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             }
         },
         observations=[
@@ -178,7 +179,8 @@ def create_conversation_entity(
                     "synth_response": response[:500],
                     "mode": mode,
                     "memories_used": memories_used[:10]  # Top 10
-                }
+                },
+                timestamp=now
             )
         ],
         relationships=[
@@ -9,6 +9,7 @@ KISS principles:
 """
 
 import logging
+import re
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -22,6 +23,14 @@ from src.chat.services.memory_search_v1 import HierarchicalMemorySearcher
 
 logger = logging.getLogger(__name__)
 
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+
+# Entity-type keywords (substring match) and observation types (exact match)
+_PROCEDURE_TYPE_KEYWORDS = ("procedure", "sop", "guide", "steps")
+_POLICY_TYPE_KEYWORDS = ("policy", "rule", "requirement")
+_STEP_OBSERVATION_TYPES = frozenset({"step", "instruction", "procedure_step"})
+_RULE_OBSERVATION_TYPES = frozenset({"rule", "requirement", "policy"})
+
 
 class AgentModeProcessor:
     """
@@ -148,8 +157,7 @@ class AgentModeProcessor:
         # Entity extraction (very basic)
         entities = []
         # Look for quoted strings
-        import re
-        quoted = re.findall(r'"([^"]+)"', message)
+        quoted = _QUOTED_RE.findall(message)
         entities.extend(quoted)
         
         return {
@@ -205,12 +213,14 @@ class AgentModeProcessor:
             entity_name = memory.get("entity_name", "")
             
             # Check if it's a procedure
-            if any(t in entity_type.lower() for t in ["procedure", "sop", "guide", "steps"]):
+            entity_type_lower = entity_type.lower()
+            if any(t in entity_type_lower for t in _PROCEDURE_TYPE_KEYWORDS):
                 # Extract steps from observations
-                steps = []
-                for obs in memory.get("observations", []):
-                    if obs.get("type") in ["step", "instruction", "procedure_step"]:
-                        steps.append(obs.get("value", ""))
+                steps = [
+                    obs.get("value", "")
+                    for obs in memory.get("observations", [])
+                    if obs.get("type") in _STEP_OBSERVATION_TYPES
+                ]
                         
                 procedures.append({
                     "name": entity_name,
@@ -239,7 +249,8 @@ class AgentModeProcessor:
                 entity_type = memory.get("entity", {}).get("type", "")
                 
                 # Check if it's a policy
-                if any(t in entity_type.lower() for t in ["policy", "rule", "requirement"]):
+                entity_type_lower = entity_type.lower()
+                if any(t in entity_type_lower for t in _POLICY_TYPE_KEYWORDS):
                     policies.append({
                         "name": memory.get("entity_name", ""),
                         "type": entity_type,
@@ -251,17 +262,15 @@ class AgentModeProcessor:
         
     def _extract_rules(self, memory: Dict[str, Any]) -> List[str]:
         """Extract rules from policy memory."""
-        rules = []
-        
-        for obs in memory.get("observations", []):
-            if obs.get("type") in ["rule", "requirement", "policy"]:
-                value = obs.get("value", "")
-                if isinstance(value, dict):
-                    rules.append(value.get("content", str(value)))
-                else:
-                    rules.append(str(value))
-                    
-        return rules
+        values = (
+            obs.get("value", "")
+            for obs in memory.get("observations", [])
+            if obs.get("type") in _RULE_OBSERVATION_TYPES
+        )
+        return [
+            value.get("content", str(value)) if isinstance(value, dict) else str(value)
+            for value in values
+        ]
         
     async def _generate_task_response(
         self,
@@ -18,6 +18,32 @@ from src.chat.models import ChatRequestV1
 
 logger = logging.getLogger(__name__)
 
+# Each pattern set is compiled once into a single case-insensitive alternation,
+# so a check is one regex scan rather than one per pattern
+_DANGEROUS_RE = re.compile("|".join(f"(?:{p})" for p in (
+    r"<script.*?>.*?</script>",  # Script injection
+    r"javascript:",  # JavaScript protocol
+    r"on\w+\s*=",  # Event handlers
+    r"union\s+select",  # SQL injection
+    r"drop\s+table",  # SQL injection
+    r"\$\{.*?\}",  # Template injection
+    r"__.*__",  # Python magic methods
+    r"eval\s*\(",  # Code execution
+    r"exec\s*\(",  # Code execution
+)), re.IGNORECASE)
+
+# Every dangerous pattern needs at least one of these substrings to match
+_DANGEROUS_TRIGGERS = ("<", ":", "=", "$", "(", "__", "union", "drop")
+
+_SENSITIVE_RE = re.compile("|".join(f"(?:{p})" for p in (
+    r"password\s*[:=]",
+    r"api[_-]?key\s*[:=]",
+    r"secret\s*[:=]",
+    r"token\s*[:=]",
+    r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",  # Email
+    r"\b\d{3}-\d{2}-\d{4}\b",  # SSN pattern
+)), re.IGNORECASE)
+
 
 class SecurityAuditor:
     """
@@ -30,19 +56,6 @@ class SecurityAuditor:
         """Initialize security auditor."""
         self.security_events = []
         
-        # Simple patterns for dangerous content
-        self.dangerous_patterns = [
-            r"<script.*?>.*?</script>",  # Script injection
-            r"javascript:",  # JavaScript protocol
-            r"on\w+\s*=",  # Event handlers
-            r"union\s+select",  # SQL injection
-            r"drop\s+table",  # SQL injection
-            r"\$\{.*?\}",  # Template injection
-            r"__.*__",  # Python magic methods
-            r"eval\s*\(",  # Code execution
-            r"exec\s*\(",  # Code execution
-        ]
-        
     def audit_request(
         self,
         request: ChatRequestV1,
@@ -254,11 +267,11 @@ class SecurityAuditor:
         """Check for dangerous patterns in text."""
         text_lower = text.lower()
         
-        for pattern in self.dangerous_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
-                
-        return False
+        # Plain prose usually has none of the trigger substrings; skip the regexes
+        if not any(trigger in text_lower for trigger in _DANGEROUS_TRIGGERS):
+            return False
+            
+        return _DANGEROUS_RE.search(text_lower) is not None
         
     def _validate_request_size(
         self,
@@ -282,24 +295,11 @@ class SecurityAuditor:
         response: Dict[str, Any]
     ) -> bool:
         """Check for sensitive data in response."""
-        # Convert to string for checking
-        response_str = str(response).lower()
+        # Convert to string for checking; the pattern is case-insensitive
+        response_str = str(response)
         
         # Check for common sensitive patterns
-        sensitive_patterns = [
-            r"password\s*[:=]",
-            r"api[_-]?key\s*[:=]",
-            r"secret\s*[:=]",
-            r"token\s*[:=]",
-            r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",  # Email
-            r"\b\d{3}-\d{2}-\d{4}\b",  # SSN pattern
-        ]
-        
-        for pattern in sensitive_patterns:
-            if re.search(pattern, response_str, re.IGNORECASE):
-                return True
-                
-        return False
+        return _SENSITIVE_RE.search(response_str) is not None
         
     def _validate_response_structure(
         self,
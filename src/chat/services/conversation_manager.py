@@ -5,6 +5,7 @@ Handles conversation flow, context window management, and
 coordination between memory retrieval and response generation.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional, AsyncGenerator
@@ -89,14 +90,15 @@ class ConversationManager:
             metadata=request.metadata
         )
         
-        # Add to conversation history
-        await self.session_manager.add_message(context.session_id, user_message)
-        
-        # Search relevant memories
-        memory_entities = await self._search_relevant_memories(
-            query=request.message,
-            synth_context=synth_context,
-            conversation_context=context
+        # Add to conversation history and search relevant memories concurrently;
+        # the search only reads the context loaded above
+        _, memory_entities = await asyncio.gather(
+            self.session_manager.add_message(context.session_id, user_message),
+            self._search_relevant_memories(
+                query=request.message,
+                synth_context=synth_context,
+                conversation_context=context
+            )
         )
         
         # Update active memory context
@@ -195,14 +197,15 @@ class ConversationManager:
             metadata=request.metadata
         )
         
-        # Add to conversation history
-        await self.session_manager.add_message(context.session_id, user_message)
-        
-        # Search relevant memories
-        memory_entities = await self._search_relevant_memories(
-            query=request.message,
-            synth_context=synth_context,
-            conversation_context=context
+        # Add to conversation history and search relevant memories concurrently;
+        # the search only reads the context loaded above
+        _, memory_entities = await asyncio.gather(
+            self.session_manager.add_message(context.session_id, user_message),
+            self._search_relevant_memories(
+                query=request.message,
+                synth_context=synth_context,
+                conversation_context=context
+            )
         )
         
         # Update active memory context
@@ -10,6 +10,7 @@ KISS principles:
 
 import asyncio
 import logging
+import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Set
 from uuid import UUID
@@ -26,6 +27,8 @@ from src.chat.models import (
 
 logger = logging.getLogger(__name__)
 
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+
 
 class ConversationStoreError(Exception):
     """Base exception for conversation storage."""
@@ -91,7 +94,7 @@ class ConversationMemoryStore:
             
             # Store via memory service
             # Using the create complete entity endpoint
-            result = await self._store_entity(entity_data)
+            result = await self._store_entity(entity_data, session)
             
             if result:
                 entity_id = result.get("entity", {}).get("id")
@@ -115,11 +118,16 @@ class ConversationMemoryStore:
             logger.error(f"Error storing conversation: {e}")
             return None
             
-    async def _store_entity(self, entity_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _store_entity(
+        self,
+        entity_data: Dict[str, Any],
+        session: ChatSessionV1
+    ) -> Optional[Dict[str, Any]]:
         """
         Store entity via memory service API.
         
-        Uses the /memory/entities/complete endpoint.
+        Uses the /memory/entities/complete endpoint. The session's context
+        is sent along so the client only drops that SYNTH's cached searches.
         """
         try:
             # The memory client doesn't have this method yet, 
@@ -127,7 +135,10 @@ class ConversationMemoryStore:
             result = await self.memory_client._make_request(
                 method="POST",
                 endpoint="/memory/entities/complete",
-                json_data=entity_data
+                json_data=entity_data,
+                client_id=session.client_user_id,
+                actor_type=entity_data["actor_type"],
+                actor_id=session.actor_id
             )
             
             return result
@@ -212,8 +223,7 @@ class ConversationMemoryStore:
         # This is where Memory Maker Crew will do better analysis
         
         # Look for quoted terms
-        import re
-        quoted = re.findall(r'"([^"]+)"', response)
+        quoted = _QUOTED_RE.findall(response)
         for term in quoted:
             if 2 < len(term) < 30:  # Reasonable entity name length
                 entities.add(term.lower().replace(" ", "_"))
@@ -122,7 +122,8 @@ class LearningPathManager:
             return []
             
         path = session.learning_path or []
-        covered_topics = self._extract_topics_from_path(path)
+        # Set lookup keeps the filter linear in the number of available topics
+        covered_topics = set(self._extract_topics_from_path(path))
         
         recommendations = []
         
@@ -223,11 +224,8 @@ class LearningPathManager:
         topics = []
         for item in path:
             # Handle "topic: objective" format
-            if ":" in item:
-                topic = item.split(":")[0].strip()
-            else:
-                topic = item
-            topics.append(topic)
+            topic, sep, _ = item.partition(":")
+            topics.append(topic.strip() if sep else item)
         return topics
         
     def _get_recommendation_reason(
@@ -21,10 +21,18 @@ from src.chat.models import ChatRequestV1
 
 logger = logging.getLogger(__name__)
 
+# Realm lookup tables, built once rather than branched on per memory
+_HIERARCHY_REALMS = frozenset({"client", "synth_class", "skill_module"})
+_ACTOR_REALMS = frozenset({"client", "synth_class"})
+_REALM_PRECEDENCE = ("client", "synth", "synth_class", "skill_module")
+
 
 class MemorySearchResult:
     """Container for memory search results with metadata."""
     
+    # Built for every search and held in the cache; skip the per-instance dict
+    __slots__ = ("memories", "realms_accessed", "relationships_traversed", "query_time_ms")
+    
     def __init__(
         self,
         memories: List[Dict[str, Any]],
@@ -216,7 +224,8 @@ class HierarchicalMemorySearcher:
                 "client": 0
             }
             
-            # Process and categorize memories
+            # Process and categorize memories, resolving each realm once
+            realms = []
             for memory in raw_memories:
                 memory_dict = memory.dict() if hasattr(memory, 'dict') else memory
                 
@@ -225,9 +234,10 @@ class HierarchicalMemorySearcher:
                 realms_accessed[realm] += 1
                 
                 memories.append(memory_dict)
+                realms.append(realm)
                 
             # Apply precedence and deduplication
-            prioritized = self._apply_precedence(memories)
+            prioritized = self._apply_precedence(memories, realms)
             
             # Simple relationship count (could be enhanced)
             relationships = context_depth * len(prioritized)
@@ -250,39 +260,33 @@ class HierarchicalMemorySearcher:
         # Check metadata for hierarchy level
         metadata = memory.get("metadata", {})
         hierarchy_level = metadata.get("hierarchy_level")
-        
-        if hierarchy_level == "client":
-            return "client"
-        elif hierarchy_level == "synth_class":
-            return "synth_class"
-        elif hierarchy_level == "skill_module":
-            return "skill_module"
-        else:
-            # Check actor_type
-            actor_type = memory.get("actor_type", "synth")
-            if actor_type == "client":
-                return "client"
-            elif actor_type == "synth_class":
-                return "synth_class"
-            else:
-                return "synth"
+        if hierarchy_level in _HIERARCHY_REALMS:
+            return hierarchy_level
+            
+        # Check actor_type
+        actor_type = memory.get("actor_type", "synth")
+        return actor_type if actor_type in _ACTOR_REALMS else "synth"
                 
-    def _apply_precedence(self, memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _apply_precedence(
+        self,
+        memories: List[Dict[str, Any]],
+        realms: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Apply precedence rules and remove duplicates.
         
         CLIENT > SYNTH > SYNTH_CLASS > SKILL_MODULE
+        
+        Realms already resolved by the caller can be passed in, parallel
+        to memories, to skip resolving them again.
         """
+        if realms is None:
+            realms = [self._determine_realm(memory) for memory in memories]
+            
         # Group by realm
-        by_realm = {
-            "client": [],
-            "synth": [],
-            "synth_class": [],
-            "skill_module": []
-        }
+        by_realm = {realm: [] for realm in _REALM_PRECEDENCE}
         
-        for memory in memories:
-            realm = self._determine_realm(memory)
+        for memory, realm in zip(memories, realms):
             by_realm[realm].append(memory)
             
         # Combine in precedence order
@@ -290,7 +294,7 @@ class HierarchicalMemorySearcher:
         seen_names: Set[str] = set()
         
         # Order matters!
-        for realm in ["client", "synth", "synth_class", "skill_module"]:
+        for realm in _REALM_PRECEDENCE:
             for memory in by_realm[realm]:
                 name = memory.get("entity_name", memory.get("name"))
                 if name and name not in seen_names:
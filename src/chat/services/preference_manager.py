@@ -66,11 +66,9 @@ class PreferenceManager:
                 for obs in memory.observations:
                     if obs.observation_type == "setting":
                         # Parse "key: value" format
-                        parts = obs.content.split(":", 1)
-                        if len(parts) == 2:
-                            key = parts[0].strip()
-                            value = parts[1].strip()
-                            preferences[key] = self._parse_value(value)
+                        key, sep, value = obs.content.partition(":")
+                        if sep:
+                            preferences[key.strip()] = self._parse_value(value.strip())
                             
             return preferences
             
@@ -5,12 +5,12 @@ Handles conversation session storage, TTL management, and
 concurrent access control for multi-instance deployments.
 """
 
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from uuid import UUID, uuid4
 
+import orjson
 import redis.asyncio as redis
 from redis.asyncio.lock import Lock
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
@@ -81,7 +81,8 @@ class ContextSerializer:
             "metadata": context.metadata
         }
         
-        return json.dumps(data)
+        # orjson also covers the UUIDs and datetimes left in model_dump() output
+        return orjson.dumps(data).decode()
         
     @staticmethod
     def deserialize(data: str) -> ConversationContext:
@@ -94,7 +95,7 @@ class ContextSerializer:
         Returns:
             ConversationContext instance
         """
-        parsed = json.loads(data)
+        parsed = orjson.loads(data)
         
         # Reconstruct SynthContext
         synth_data = parsed["synth_context"]
@@ -198,7 +199,7 @@ class SessionContextStore:
                 
             return ContextSerializer.deserialize(data)
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to deserialize session {session_id}: {e}")
             return None
         except RedisError as e:
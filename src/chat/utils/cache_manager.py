@@ -9,6 +9,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from uuid import UUID
 
+import orjson
 import redis.asyncio as redis
 from cachetools import TTLCache
 
@@ -160,7 +161,7 @@ class CacheManager:
                 if cached_data:
                     logger.debug(f"Memory search cache hit (Redis): {cache_key[:20]}...")
                     # Deserialize memory entities
-                    entities_data = json.loads(cached_data)
+                    entities_data = orjson.loads(cached_data)
                     entities = [MemoryEntity(**data) for data in entities_data]
                     
                     # Store in local cache
@@ -209,7 +210,7 @@ class CacheManager:
                 await self.redis_client.setex(
                     redis_key,
                     ttl_seconds,
-                    json.dumps(entities_data, default=str)
+                    orjson.dumps(entities_data, default=str)
                 )
                 
             except Exception as e:
@@ -1,7 +1,9 @@
 """
 Database connection management using SQLAlchemy with async support.
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from pgvector.asyncpg import register_vector
 from contextlib import asynccontextmanager
 import logging
 import warnings
@@ -61,6 +63,28 @@ def create_pooled_engine():
 direct_engine = create_direct_engine()  # For admin, migrations, schema operations
 pooled_engine = create_pooled_engine()  # For API, high-concurrency operations
 
+# Key in each connection's info dict recording whether the pgvector codec registered
+VECTOR_CODEC_KEY = "pgvector_codec"
+
+def register_vector_codec(async_engine):
+    """Register pgvector's binary codec on every new connection of an engine.
+
+    The outcome is stored under VECTOR_CODEC_KEY in the connection's info, so
+    vector writers can send text literals on connections without the codec.
+    """
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _register_vector(dbapi_connection, connection_record):
+        try:
+            dbapi_connection.run_async(register_vector)
+            connection_record.info[VECTOR_CODEC_KEY] = True
+        except Exception as e:
+            # Databases without the vector extension still need to connect
+            connection_record.info[VECTOR_CODEC_KEY] = False
+            logger.warning(f"pgvector codec not registered, sending vectors as text: {e}")
+
+register_vector_codec(direct_engine)
+register_vector_codec(pooled_engine)
+
 # Primary engine - defaults to direct for backwards compatibility
 engine = direct_engine
 
@@ -25,7 +25,7 @@ Valid actor_type values and their corresponding tables:
 This allows the memory system to work across different contexts without requiring
 a direct client_id relationship on every memory entity.
 """
-from sqlalchemy import Column, String, DateTime, Text, Integer, BigInteger, Date, Boolean, Index, Numeric, Float, Time, func, text
+from sqlalchemy import Column, String, DateTime, Text, Integer, BigInteger, LargeBinary, Date, Boolean, Index, Numeric, Float, Time, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB, JSON, TIMESTAMP
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -234,6 +234,10 @@ class CrewMemory(Base):
 
 class DocumentVectors(Base):
     __tablename__ = "document_vectors"
+    __table_args__ = (
+        # Conflict target for the vectorization UPSERT
+        Index("idx_document_vectors_source_chunk", "source_table", "source_id", "chunk_index", unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, server_default=text('gen_random_uuid()'))
     source_table = Column(Text, nullable=False)
@@ -243,6 +247,7 @@ class DocumentVectors(Base):
     chunk_text = Column(Text, nullable=False)
     embedding = Column(String)
     metadata_json = Column('metadata', JSONB, server_default=text("'{}'::jsonb"))
+    content_hash = Column(LargeBinary)  # Digest of chunk_text, to skip unchanged chunks
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
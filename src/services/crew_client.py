@@ -7,8 +7,9 @@ providing retry logic, error handling, and proper authentication.
 
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 
 import httpx
@@ -64,12 +65,13 @@ class CrewClient:
         self.base_url = (base_url or CREWS_SERVICE_URL).rstrip('/')
         self.config = config or DEFAULT_CONFIG
         
-        # HTTP client configuration
+        # HTTP client configuration; one pooled client is reused across requests
         self.http_config = create_http_client_config(self.config)
+        self._http_client: Optional[httpx.AsyncClient] = None
         
-        # Internal token cache
+        # Internal token cache; expiry is a time.monotonic() deadline
         self._token_cache = None
-        self._token_expires = None
+        self._token_expires = 0.0
         
         logger.info(
             f"CrewClient initialized for service at {self.base_url}",
@@ -88,21 +90,31 @@ class CrewClient:
         Returns:
             Valid JWT token for internal service communication
         """
-        now = datetime.utcnow()
+        now = time.monotonic()
         
         # Check if cached token is still valid (with configured buffer)
-        buffer_minutes = self.config.token_refresh_buffer
-        if (self._token_cache and self._token_expires and 
-            self._token_expires > now + timedelta(minutes=buffer_minutes)):
+        buffer_seconds = self.config.token_refresh_buffer * 60
+        if self._token_cache and self._token_expires > now + buffer_seconds:
             return self._token_cache
         
         # Generate new token
         self._token_cache = get_internal_token()
-        self._token_expires = now + timedelta(hours=self.config.token_cache_duration)
+        self._token_expires = now + self.config.token_cache_duration * 3600
         
         logger.debug("Generated new internal authentication token")
         return self._token_cache
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client, creating it on first use
+        
+        Returns:
+            Shared httpx client keeping connections alive between requests
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(**self.http_config)
+        return self._http_client
+    
     def _map_http_error(self, response: httpx.Response) -> CrewClientError:
         """
         Map HTTP response to appropriate exception
@@ -166,43 +178,43 @@ class CrewClient:
         request_id = kwargs.get('request_id', f"crew-client-{datetime.utcnow().timestamp()}")
         headers['X-Request-ID'] = request_id
         
-        start_time = datetime.utcnow()
+        start_time = time.monotonic()
         logger.info(f"Making {method} request to {endpoint}", extra={'request_id': request_id})
         
-        async with httpx.AsyncClient(**self.http_config) as client:
-            try:
-                response = await client.request(method, url, **kwargs)
-                
-                # Calculate request duration
-                duration = (datetime.utcnow() - start_time).total_seconds()
-                
-                # Log with metrics
-                metrics = format_request_metrics(
-                    method=method,
-                    endpoint=endpoint,
-                    status_code=response.status_code,
-                    duration=duration,
-                    request_id=request_id
-                )
-                
-                logger.info(
-                    f"Request completed: {method} {endpoint} - {response.status_code}",
-                    extra=metrics
-                )
-                
-                return response
-                
-            except httpx.ConnectError as e:
-                logger.error(f"Connection failed to {url}: {e}", extra={'request_id': request_id})
-                raise CrewServiceUnavailableError(f"Cannot connect to crews service: {e}")
+        client = self._get_http_client()
+        try:
+            response = await client.request(method, url, **kwargs)
             
-            except httpx.TimeoutException as e:
-                logger.error(f"Request timeout to {url}: {e}", extra={'request_id': request_id})
-                raise CrewServiceUnavailableError(f"Request timeout: {e}")
+            # Calculate request duration
+            duration = time.monotonic() - start_time
             
-            except Exception as e:
-                logger.error(f"Unexpected error for {url}: {e}", extra={'request_id': request_id})
-                raise CrewClientError(f"Request failed: {e}")
+            # Log with metrics
+            metrics = format_request_metrics(
+                method=method,
+                endpoint=endpoint,
+                status_code=response.status_code,
+                duration=duration,
+                request_id=request_id
+            )
+            
+            logger.info(
+                f"Request completed: {method} {endpoint} - {response.status_code}",
+                extra=metrics
+            )
+            
+            return response
+            
+        except httpx.ConnectError as e:
+            logger.error(f"Connection failed to {url}: {e}", extra={'request_id': request_id})
+            raise CrewServiceUnavailableError(f"Cannot connect to crews service: {e}")
+        
+        except httpx.TimeoutException as e:
+            logger.error(f"Request timeout to {url}: {e}", extra={'request_id': request_id})
+            raise CrewServiceUnavailableError(f"Request timeout: {e}")
+        
+        except Exception as e:
+            logger.error(f"Unexpected error for {url}: {e}", extra={'request_id': request_id})
+            raise CrewClientError(f"Request failed: {e}")
     
     async def execute_crew(
         self,
@@ -228,8 +240,8 @@ class CrewClient:
             CrewExecutionError: If crew execution fails
             CrewServiceUnavailableError: If service is unavailable
         """
-        start_time = datetime.utcnow()
-        request_id = request_id or f"execute-{crew_name}-{start_time.timestamp()}"
+        start_time = time.monotonic()
+        request_id = request_id or f"execute-{crew_name}-{datetime.utcnow().timestamp()}"
         
         logger.info(
             f"Executing crew '{crew_name}' via HTTP",
@@ -265,7 +277,7 @@ class CrewClient:
             execution_result = CrewExecutionResponse(**result_data)
             
             # Calculate total execution time
-            total_time = (datetime.utcnow() - start_time).total_seconds()
+            total_time = time.monotonic() - start_time
             
             if execution_result.success:
                 # Log success with metrics
@@ -316,7 +328,7 @@ class CrewClient:
             raise
             
         except Exception as e:
-            total_time = (datetime.utcnow() - start_time).total_seconds()
+            total_time = time.monotonic() - start_time
             logger.error(
                 f"Unexpected error executing crew '{crew_name}': {e}",
                 extra={
@@ -421,9 +433,14 @@ class CrewClient:
     
     async def close(self):
         """Close the client and cleanup resources"""
+        # Close pooled connections
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        
         # Clear token cache
         self._token_cache = None
-        self._token_expires = None
+        self._token_expires = 0.0
         
         logger.info("CrewClient closed")
 
@@ -114,6 +114,7 @@ def create_http_client_config(config: CrewClientConfig = None) -> Dict:
         ),
         "follow_redirects": True,
         "verify": True,  # SSL verification
+        "http2": True,  # Negotiated via ALPN; falls back to HTTP/1.1
     }
 
 
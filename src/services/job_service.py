@@ -153,12 +153,16 @@ class JobService:
             logger.error(f"Failed to create job: {e}")
             raise ValueError(f"Database error: {e}")
 
-    async def get_job_status(self, job_id: str) -> Optional[JobStatusResponse]:
+    async def get_job_status(
+        self, job_id: str, include_details: bool = True
+    ) -> Optional[JobStatusResponse]:
         """
         Get job status and details.
 
         Args:
             job_id: Job identifier
+            include_details: Include the result and events; pollers that only
+                need the status can skip the events query and result payload
 
         Returns:
             Job status response or None if not found
@@ -170,6 +174,16 @@ class JobService:
                 if not job:
                     return None
 
+                if not include_details:
+                    return JobStatusResponse(
+                        job_id=str(job.id),
+                        status=job.status,
+                        created_at=job.created_at,
+                        started_at=job.started_at,
+                        completed_at=job.finished_at,
+                        error_message=job.last_error,
+                    )
+
                 # Get job events
                 events_result = await session.execute(
                     select(CrewJobEvent)
@@ -4,12 +4,15 @@ JSON Schema Validation Service
 Validates incoming JSON data against schemas stored in the object_schemas database table.
 All schemas contain required fields: job_key, client_user_id, actor_type, actor_id.
 """
-import json
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 try:
-    from jsonschema import validate, ValidationError, Draft7Validator
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
     JSONSCHEMA_AVAILABLE = True
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
@@ -25,6 +28,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Shared immutable error list for successful validations
+_EMPTY: tuple = ()
+
 class SchemaValidationError(Exception):
     """Custom exception for schema validation errors."""
     def __init__(self, message: str, errors: List[str] = None):
@@ -35,13 +41,15 @@ class JSONSchemaValidator:
     """
     Validates JSON data against schemas stored in the database.
     
-    Uses direct database queries for efficiency - no caching overhead.
+    Uses direct database queries so schema edits take effect immediately.
+    Compiled validators are cached by schema content, so an edited schema
+    simply gets a new cache entry.
     All crew request schemas must include core required fields.
     """
     
     def __init__(self):
         """Initialize validator."""
-        pass
+        self._validator_cache: Dict[str, Any] = {}
     
     async def get_schema_by_name(self, schema_name: str, db=None) -> Optional[Dict[str, Any]]:
         """Get a specific schema by name directly from database - no caching."""
@@ -96,53 +104,66 @@ class JSONSchemaValidator:
             result = await db.execute(stmt)
             schemas = result.scalars().all()
             
-            crew_schemas = {}
-            for schema_record in schemas:
-                crew_schemas[schema_record.name] = {
+            # Index by name; unnamed records can't be looked up by job_key anyway
+            crew_schemas = {
+                schema_record.name: {
                     'id': schema_record.id,
                     'name': schema_record.name,
                     'object_type': schema_record.object_type,
                     'schema': schema_record.schema_data,
                     'description': schema_record.description,
                 }
+                for schema_record in schemas
+                if schema_record.name
+            }
             
-            logger.info(f"Loaded {len(crew_schemas)} crew/gen_crew schemas from database")
+            logger.info("Loaded %d crew/gen_crew schemas from database", len(crew_schemas))
             return crew_schemas
             
         except Exception as e:
-            logger.error(f"Failed to load crew schemas from database: {e}")
+            logger.error("Failed to load crew schemas from database: %s", e)
             raise SchemaValidationError(f"Unable to load crew schemas: {e}")
 
-    async def _determine_schema_from_job_key(self, job_key: str, db) -> Optional[str]:
+    async def _determine_schema_from_job_key(self, job_key: str, db) -> Optional[Dict[str, Any]]:
         """
-        Determine schema name from job_key by checking if a schema with that name exists.
-        Direct database lookup - no caching overhead.
+        Determine schema from job_key by checking if a schema with that name exists.
+        Direct database lookup - the loaded schema is returned so callers don't fetch it twice.
         """
         # First try exact match - most common case for both crew and gen_crew
         schema_data = await self._get_single_schema(job_key, db)
         if schema_data and schema_data['object_type'] in ['crew', 'gen_crew']:
-            logger.info(f"Found {schema_data['object_type']} schema for job_key '{job_key}' (exact match)")
-            return job_key
+            logger.info("Found %s schema for job_key '%s' (exact match)", schema_data['object_type'], job_key)
+            return schema_data
         
-        logger.warning(f"No schema found for job_key: {job_key}")
-        return None
-        for schema_name, schema_data in self._schema_cache.items():
-            schema_content = schema_data.get('schema', {})
-            if isinstance(schema_content, dict):
-                # Check if this schema is designed for this job_key
-                if 'properties' in schema_content and 'job_key' in schema_content['properties']:
-                    job_key_property = schema_content['properties']['job_key']
-                    if isinstance(job_key_property, dict):
-                        # Check if job_key is in enum values
-                        if 'enum' in job_key_property and job_key in job_key_property['enum']:
-                            return schema_name
-                        # Check if job_key matches a const value
-                        if 'const' in job_key_property and job_key_property['const'] == job_key:
-                            return schema_name
-        
-        # No schema found for this job_key
+        logger.warning("No schema found for job_key: %s", job_key)
         return None
     
+    async def warm_cache(self, db=None) -> int:
+        """
+        Pre-compile validators for every crew and gen_crew schema.
+        
+        Intended for application startup so the first request for each job_key
+        doesn't pay the schema compilation cost.
+        
+        Returns:
+            Number of schemas compiled successfully
+        """
+        if not JSONSCHEMA_AVAILABLE:
+            return 0
+        
+        crew_schemas = await self.get_crew_request_schemas(db)
+        
+        compiled_count = 0
+        for schema_name, schema_data in crew_schemas.items():
+            try:
+                self._get_compiled_validator(schema_data['schema'])
+                compiled_count += 1
+            except Exception as e:
+                logger.warning("Failed to compile schema '%s': %s", schema_name, e)
+        
+        logger.info("Warmed validator cache with %d of %d crew schemas", compiled_count, len(crew_schemas))
+        return compiled_count
+    
     def _validate_core_fields(self, data: Dict[str, Any]) -> List[str]:
         """
         Validate that all core required fields are present.
@@ -178,69 +199,157 @@ class JSONSchemaValidator:
         Raises:
             SchemaValidationError: If validation fails
         """
-        if db is None and SQLALCHEMY_AVAILABLE:
+        if db is not None:
+            return await self._validate_with_db(data, schema_name, job_key, db)
+        
+        if not SQLALCHEMY_AVAILABLE:
+            raise SchemaValidationError("SQLAlchemy not available for database operations")
+        
+        # One session for the whole validation - helpers below reuse it
+        async with get_direct_session() as db:
+            return await self._validate_with_db(data, schema_name, job_key, db)
+    
+    def _get_compiled_validator(self, schema: Dict[str, Any]) -> Any:
+        """Get a compiled validator, building it once per distinct schema content."""
+        cache_key = hashlib.sha256(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        compiled = self._validator_cache.get(cache_key)
+        if compiled is None:
+            validator_cls = validator_for(schema)
+            validator_cls.check_schema(schema)
+            compiled = validator_cls(schema)
+            self._validator_cache[cache_key] = compiled
+        return compiled
+    
+    def _compile_schema_check(self, schema: Dict[str, Any]) -> Callable[[Dict[str, Any]], List[str]]:
+        """
+        Compile a schema once and return a function producing its errors for a payload.
+        
+        A schema that fails to compile reports the failure as a validation error
+        for every payload, matching jsonschema.validate behaviour.
+        """
+        if not JSONSCHEMA_AVAILABLE:
+            return lambda data: ["JSONSchema library not available - skipping schema validation"]
+        
+        try:
+            compiled = self._get_compiled_validator(schema)
+        except Exception as e:
+            compile_error = f"Validation error: {str(e)}"
+            return lambda data: [compile_error]
+        
+        def check(data: Dict[str, Any]) -> List[str]:
+            try:
+                error = best_match(compiled.iter_errors(data))
+            except Exception as e:
+                return [f"Validation error: {str(e)}"]
+            if error is not None:
+                return [f"Schema validation error: {error.message}"]
+            return []
+        
+        return check
+    
+    async def validate_many(self, data_list: List[Dict[str, Any]], schema_name: Optional[str] = None,
+                            job_key: Optional[str] = None, db=None) -> Tuple[List[bool], List[List[str]]]:
+        """
+        Validate a batch of payloads that share one schema.
+        
+        The schema is resolved and compiled once, then applied to every item.
+        When neither schema_name nor job_key is given, the job_key of the first
+        item selects the schema for the whole batch.
+        
+        Args:
+            data_list: Payloads to validate
+            schema_name: Specific schema name to use (optional)
+            job_key: Job key to determine schema automatically (optional)
+            db: Database session (optional, will create if needed)
+            
+        Returns:
+            Tuple of (valid flag per item, error list per item)
+            
+        Raises:
+            SchemaValidationError: If the schema cannot be resolved
+        """
+        if not data_list:
+            return [], []
+        
+        if db is None:
+            if not SQLALCHEMY_AVAILABLE:
+                raise SchemaValidationError("SQLAlchemy not available for database operations")
             async with get_direct_session() as db:
-                return await self._validate_with_db(data, schema_name, job_key, db)
+                schema_data = await self._resolve_schema(data_list[0], schema_name, job_key, db)
         else:
-            return await self._validate_with_db(data, schema_name, job_key, db)
+            schema_data = await self._resolve_schema(data_list[0], schema_name, job_key, db)
+        
+        schema_check = self._compile_schema_check(schema_data['schema'])
+        
+        valid_mask = []
+        errors_per_item = []
+        for data in data_list:
+            errors = self._validate_core_fields(data)
+            errors.extend(schema_check(data))
+            valid_mask.append(not errors)
+            errors_per_item.append(errors)
+        
+        invalid_count = valid_mask.count(False)
+        if invalid_count:
+            logger.warning("Batch validation for schema '%s': %d of %d payloads invalid",
+                           schema_data['name'], invalid_count, len(data_list))
+        
+        return valid_mask, errors_per_item
+    
+    async def _resolve_schema(self, data: Dict[str, Any], schema_name: Optional[str],
+                              job_key: Optional[str], db) -> Dict[str, Any]:
+        """Resolve and load the target schema with a single database lookup."""
+        if schema_name:
+            # Load schema from database - NO FALLBACKS!
+            schema_data = await self._get_single_schema(schema_name, db)
+            if not schema_data:
+                raise SchemaValidationError(f"Schema '{schema_name}' not found in database")
+            return schema_data
+        
+        # Fall back to the job_key carried in the data itself
+        job_key = job_key or data.get('job_key')
+        if not job_key:
+            raise SchemaValidationError("No schema_name provided and no job_key found in data")
+        
+        schema_data = await self._determine_schema_from_job_key(job_key, db)
+        if not schema_data:
+            raise SchemaValidationError(f"No schema mapping found for job_key: {job_key}")
+        return schema_data
     
     async def _validate_with_db(self, data: Dict[str, Any], schema_name: Optional[str], 
                                job_key: Optional[str], db) -> Dict[str, Any]:
         """Internal validation method with database session."""
-        # Determine schema to use
-        if schema_name:
-            target_schema_name = schema_name
-        elif job_key:
-            target_schema_name = await self._determine_schema_from_job_key(job_key, db)
-            if not target_schema_name:
-                raise SchemaValidationError(f"No schema mapping found for job_key: {job_key}")
-        else:
-            # Try to extract job_key from data
-            job_key_from_data = data.get('job_key')
-            if job_key_from_data:
-                target_schema_name = await self._determine_schema_from_job_key(job_key_from_data, db)
-                if not target_schema_name:
-                    raise SchemaValidationError(f"No schema mapping found for job_key: {job_key_from_data}")
-            else:
-                raise SchemaValidationError("No schema_name provided and no job_key found in data")
-        
-        # Load schema from database - NO FALLBACKS!
-        schema_data = await self.get_schema_by_name(target_schema_name, db)
-        if not schema_data:
-            raise SchemaValidationError(f"Schema '{target_schema_name}' not found in database")
+        schema_data = await self._resolve_schema(data, schema_name, job_key, db)
+        target_schema_name = schema_data['name']
         
         # Always validate core fields first
         core_errors = self._validate_core_fields(data)
         
         # Validate against JSON schema
-        schema_errors = []
-        if JSONSCHEMA_AVAILABLE:
-            try:
-                validate(instance=data, schema=schema_data['schema'])
-            except ValidationError as e:
-                schema_errors.append(f"Schema validation error: {e.message}")
-            except Exception as e:
-                schema_errors.append(f"Validation error: {str(e)}")
-        else:
-            schema_errors.append("JSONSchema library not available - skipping schema validation")
+        schema_errors = self._compile_schema_check(schema_data['schema'])(data)
+        
+        # Fast path - nothing to combine when validation succeeded
+        if not core_errors and not schema_errors:
+            logger.info("Validation successful for schema '%s'", target_schema_name)
+            return {
+                'valid': True,
+                'schema_used': target_schema_name,
+                'schema_id': schema_data['id'],
+                'errors': _EMPTY,
+                'validated_data': data
+            }
         
         # Combine all errors
         all_errors = core_errors + schema_errors
+        logger.warning("Validation failed for schema '%s': %s", target_schema_name, all_errors)
         
-        result = {
-            'valid': len(all_errors) == 0,
+        return {
+            'valid': False,
             'schema_used': target_schema_name,
-            'schema_id': schema_data['id'] if schema_data else None,
+            'schema_id': schema_data['id'],
             'errors': all_errors,
-            'validated_data': data if len(all_errors) == 0 else None
+            'validated_data': None
         }
-        
-        if all_errors:
-            logger.warning(f"Validation failed for schema '{target_schema_name}': {all_errors}")
-        else:
-            logger.info(f"Validation successful for schema '{target_schema_name}'")
-        
-        return result
 
 # Global validator instance
 validator = JSONSchemaValidator()
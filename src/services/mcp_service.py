@@ -4,12 +4,16 @@ Integrates with our Railway-hosted MCP servers for extensible tool ecosystem
 """
 import os
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 import asyncio
-import json
 import httpx
+import jwt
+import orjson
 
-from crewai_tools import MCPServerAdapter
+if TYPE_CHECKING:
+    # crewai_tools is slow to import; load it on first adapter creation instead
+    from crewai_tools import MCPServerAdapter
 
 from config import (
     MCP_REGISTRY_URL,
@@ -19,28 +23,24 @@ from config import (
     API_SECRET_KEY
 )
 
-"""
-Model Context Protocol (MCP) Service
-Integrates with our Railway-hosted MCP servers for extensible tool ecosystem
-"""
-import os
-import logging
-from typing import Dict, Any, List, Optional
-import asyncio
-import json
-import httpx
+logger = logging.getLogger(__name__)
 
-from crewai_tools import MCPServerAdapter
+# Parsed MCP config files keyed by (path, mtime_ns) so edits invalidate the entry
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
-from config import (
-    MCP_REGISTRY_URL,
-    MCP_SERVERS_CONFIG_PATH,
-    ENVIRONMENT,
-    MCP_REGISTRY_ENABLED,
-    API_SECRET_KEY
-)
+# Registry token shared by all instances; re-encoded shortly before it expires
+_TOKEN_TTL_SECONDS = 24 * 60 * 60
+_TOKEN_REFRESH_MARGIN_SECONDS = 60
+_token_cache: Dict[str, Any] = {"token": None, "expires_at": 0.0}
+_STATIC_TOKEN_CLAIMS: Dict[str, Any] = {"sub": "mcp-service", "scopes": ["sparkjar_internal"]}
 
-logger = logging.getLogger(__name__)
+# Registry discovery results keyed by (endpoint, params); failures are cached briefly
+# so a down registry is not re-queried on every call
+_DISCOVERY_TTL_SECONDS = 5 * 60
+_DISCOVERY_FAILURE_TTL_SECONDS = 30
+_discovery_cache: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[float, List[Dict[str, Any]]]] = {}
+# One lock per cache key, so a slow lookup only holds up callers of the same listing
+_discovery_locks: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], asyncio.Lock] = {}
 
 class MCPService:
     """Service for managing MCP tool integration with CrewAI."""
@@ -50,17 +50,30 @@ class MCPService:
         self.registry_url = MCP_REGISTRY_URL
         self.registry_enabled = MCP_REGISTRY_ENABLED
         self.servers_config_path = MCP_SERVERS_CONFIG_PATH
-        self.available_adapters: List[MCPServerAdapter] = []
+        self.available_adapters: List["MCPServerAdapter"] = []
         self.available_tools: List[Any] = []
-        self.api_token = self._generate_api_token()
         self._load_mcp_configuration()
+
+    @property
+    def api_token(self) -> str:
+        """JWT for the MCP registry, cached until a minute before it expires."""
+        if time.time() >= _token_cache["expires_at"] - _TOKEN_REFRESH_MARGIN_SECONDS:
+            _token_cache["token"], _token_cache["expires_at"] = self._generate_api_token()
+        return _token_cache["token"]
     
     def _load_mcp_configuration(self) -> None:
         """Load MCP server configuration."""
         try:
             if self.servers_config_path and os.path.exists(self.servers_config_path):
-                with open(self.servers_config_path, 'r') as f:
-                    self.mcp_config = json.load(f)
+                cache_key = (self.servers_config_path, os.stat(self.servers_config_path).st_mtime_ns)
+                cached_config = _CONFIG_CACHE.get(cache_key)
+                if cached_config is not None:
+                    self.mcp_config = cached_config
+                    return
+                
+                with open(self.servers_config_path, 'rb') as f:
+                    self.mcp_config = orjson.loads(f.read())
+                _CONFIG_CACHE[cache_key] = self.mcp_config
                 logger.info(f"Loaded MCP configuration from {self.servers_config_path}")
             else:
                 # Default MCP configuration for Railway servers
@@ -90,70 +103,73 @@ class MCPService:
             logger.error(f"Failed to load MCP configuration: {str(e)}")
             self.mcp_config = {"servers": [], "default_tools": []}
     
-    def _generate_api_token(self) -> str:
-        """Generate a JWT token for API authentication."""
-        import jwt
-        from datetime import datetime, timedelta
+    def _generate_api_token(self) -> Tuple[str, float]:
+        """Generate a JWT token for API authentication and its expiry timestamp."""
+        expires_at = time.time() + _TOKEN_TTL_SECONDS
+        payload = {**_STATIC_TOKEN_CLAIMS, "exp": int(expires_at)}
+        return jwt.encode(payload, API_SECRET_KEY, algorithm="HS256"), expires_at
+    
+    async def _discover_from_registry(
+        self,
+        endpoint: str,
+        result_key: str,
+        params: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch a registry listing, sharing cached results across concurrent callers."""
+        params = params or {}
+        cache_key = (endpoint, tuple(sorted(params.items())))
+        
+        cached = _discovery_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
         
-        payload = {
-            "sub": "mcp-service",
-            "scopes": ["sparkjar_internal"],
-            "exp": datetime.utcnow() + timedelta(hours=24)
-        }
-        return jwt.encode(payload, API_SECRET_KEY, algorithm="HS256")
+        async with _discovery_locks.setdefault(cache_key, asyncio.Lock()):
+            # Another caller may have refreshed the entry while we waited
+            cached = _discovery_cache.get(cache_key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            
+            try:
+                async with httpx.AsyncClient() as client:
+                    headers = {"Authorization": f"Bearer {self.api_token}"}
+                    response = await client.get(
+                        f"{self.registry_url}{endpoint}",
+                        headers=headers,
+                        params=params
+                    )
+                    response.raise_for_status()
+                    
+                    data = orjson.loads(response.content)
+                    results = data.get(result_key, [])
+                    logger.info("Discovered %d %s from MCP registry", len(results), result_key)
+                    ttl = _DISCOVERY_TTL_SECONDS
+                    
+            except Exception as e:
+                logger.error("Failed to discover %s from registry: %s", result_key, e)
+                results = []
+                ttl = _DISCOVERY_FAILURE_TTL_SECONDS
+            
+            _discovery_cache[cache_key] = (time.monotonic() + ttl, results)
+            return results
     
     async def discover_services_from_registry(self, service_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Discover available MCP services from registry."""
         if not self.registry_enabled or not self.registry_url:
             return []
         
-        try:
-            async with httpx.AsyncClient() as client:
-                headers = {"Authorization": f"Bearer {self.api_token}"}
-                params = {}
-                if service_type:
-                    params["service_type"] = service_type
-                    
-                response = await client.get(
-                    f"{self.registry_url}/mcp/registry/services",
-                    headers=headers,
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                services = data.get("services", [])
-                logger.info(f"Discovered {len(services)} services from MCP registry")
-                return services
-                
-        except Exception as e:
-            logger.error(f"Failed to discover services from registry: {str(e)}")
-            return []
+        params = {}
+        if service_type:
+            params["service_type"] = service_type
+        return await self._discover_from_registry("/mcp/registry/services", "services", params)
     
     async def discover_tools_from_registry(self) -> List[Dict[str, Any]]:
         """Discover available tools from our Railway MCP registry."""
         if not self.registry_enabled or not self.registry_url:
             return []
         
-        try:
-            async with httpx.AsyncClient() as client:
-                headers = {"Authorization": f"Bearer {self.api_token}"}
-                response = await client.get(
-                    f"{self.registry_url}/mcp/registry/tools",
-                    headers=headers
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                tools = data.get("tools", [])
-                logger.info(f"Discovered {len(tools)} tools from MCP registry")
-                return tools
-                
-        except Exception as e:
-            logger.error(f"Failed to discover tools from registry: {str(e)}")
-            return []
+        return await self._discover_from_registry("/mcp/registry/tools", "tools")
     
-    def connect_to_mcp_server(self, server_config: Dict[str, Any]) -> Optional[MCPServerAdapter]:
+    def connect_to_mcp_server(self, server_config: Dict[str, Any]) -> Optional["MCPServerAdapter"]:
         """Connect to a specific MCP server and create adapter."""
         try:
             server_url = server_config.get("url")
@@ -163,6 +179,8 @@ class MCPService:
                 logger.warning(f"No URL provided for MCP server: {server_name}")
                 return None
             
+            from crewai_tools import MCPServerAdapter
+            
             # Create MCP server adapter for SSE connection
             adapter = MCPServerAdapter({
                 "url": server_url,
@@ -202,9 +220,9 @@ class MCPService:
                             with adapter as server_tools:
                                 tools.extend(server_tools)
                                 adapters.append(adapter)
-                                logger.info(f"Loaded {len(server_tools)} tools from {server_config['name']}")
+                                logger.info("Loaded %d tools from %s", len(server_tools), server_config['name'])
                         except Exception as e:
-                            logger.error(f"Failed to start MCP server {server_config['name']}: {str(e)}")
+                            logger.error("Failed to start MCP server %s: %s", server_config['name'], e)
             else:
                 # Load tools from static configuration
                 for server_config in self.mcp_config.get("servers", []):
@@ -215,17 +233,17 @@ class MCPService:
                             with adapter as server_tools:
                                 tools.extend(server_tools)
                                 adapters.append(adapter)
-                                logger.info(f"Loaded {len(server_tools)} tools from {server_config['name']}")
+                                logger.info("Loaded %d tools from %s", len(server_tools), server_config['name'])
                         except Exception as e:
-                            logger.error(f"Failed to start MCP server {server_config['name']}: {str(e)}")
+                            logger.error("Failed to start MCP server %s: %s", server_config['name'], e)
             
             self.available_adapters = adapters
             self.available_tools = tools
-            logger.info(f"Loaded {len(tools)} MCP tools total from {len(adapters)} servers")
+            logger.info("Loaded %d MCP tools total from %d servers", len(tools), len(adapters))
             return tools
             
         except Exception as e:
-            logger.error(f"Failed to load MCP tools: {str(e)}")
+            logger.error("Failed to load MCP tools: %s", e)
             return []
     
     def get_available_tools(self) -> List[Any]:
@@ -235,6 +253,7 @@ class MCPService:
     async def refresh_tools(self) -> None:
         """Refresh the list of available MCP tools."""
         logger.info("Refreshing MCP tools...")
+        _discovery_cache.clear()
         await self.load_all_mcp_tools()
     
     def get_tool_by_name(self, name: str) -> Optional[Any]:
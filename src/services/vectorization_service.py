@@ -3,26 +3,230 @@ Vectorization service for storing document embeddings in PostgreSQL
 Uses the generic document_vectors table with pgvector
 """
 
-import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import numpy as np
+import orjson
+import tiktoken
+from pgvector import Vector
+from typing import List, Dict, Any, Optional, Tuple
 import httpx
 from config import EMBEDDINGS_API_URL, EMBEDDING_MODEL, EMBEDDING_DIMENSION
 from sparkjar_shared.utils.embedding_client import EmbeddingClient
 
-from sqlalchemy import select, text
-from database.connection import get_direct_session
+from sqlalchemy import text
+from database.connection import VECTOR_CODEC_KEY, get_direct_session
 
 logger = logging.getLogger(__name__)
 
+# Column order for COPY records into document_vectors
+COPY_COLUMNS = (
+    "source_table",
+    "source_id",
+    "source_column",
+    "chunk_index",
+    "chunk_text",
+    "embedding",
+    "metadata",
+    "content_hash",
+)
+
+# Chunks as parallel arrays: start offsets, end offsets, chunk texts
+Chunks = Tuple[np.ndarray, np.ndarray, List[str]]
+
+# datetimes are written as UTC ISO 8601 strings, with naive values taken as UTC
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# event_data fields always included in full in the event text
+_IMPORTANT_EVENT_KEYS = frozenset({"message", "thought", "action", "observation", "error"})
+_SIMPLE_TYPES = frozenset({str, int, float, bool})
+
+# Windows buffered between the chunking, embedding and writing stages
+_PIPELINE_QUEUE_SIZE = 8
+
+# Events written per transaction; see vectorize_job_events for the tradeoff
+_COMMIT_EVERY_EVENTS = 1000
+
+# Seconds a job waits for the tokenizer before chunking by characters
+_TOKENIZER_LOAD_TIMEOUT = 30.0
+
+# Tokenizer shared by every service instance, and the load that produces it
+_tokenizer = None
+_tokenizer_load: Optional[asyncio.Future] = None
+
+# Statements are built once so SQLAlchemy's compiled cache and asyncpg's
+# prepared statement cache are hit on every call
+_CONTENT_HASHES_SQL = text(
+    """
+    SELECT source_id, chunk_index, content_hash FROM document_vectors
+    WHERE source_table = 'crew_job_event'
+      AND source_id = ANY(:source_ids)
+"""
+)
+
+# Search compares half-precision vectors to match the halfvec HNSW index
+_HALFVEC_TYPE = f"halfvec({EMBEDDING_DIMENSION})"
+
+# One statement for every search; unused filters are passed as NULL. Metadata
+# filters use JSONB containment so the GIN index on metadata can serve them.
+_SEARCH_SQL = text(
+    f"""
+    SELECT
+        id,
+        source_table,
+        source_id,
+        chunk_index,
+        chunk_text,
+        metadata,
+        1 - (embedding::{_HALFVEC_TYPE}
+             <=> CAST(:embedding AS {_HALFVEC_TYPE})) AS similarity
+    FROM document_vectors
+    WHERE (CAST(:source_table AS text) IS NULL OR source_table = :source_table)
+      AND (CAST(:metadata_filter AS jsonb) IS NULL
+           OR metadata @> CAST(:metadata_filter AS jsonb))
+    ORDER BY embedding::{_HALFVEC_TYPE} <=> CAST(:embedding AS {_HALFVEC_TYPE})
+    LIMIT :limit
+"""
+)
+
+# Drops chunks past an event's current chunk count, left behind when the text
+# got shorter or a different chunker produced fewer chunks
+_DELETE_TRAILING_CHUNKS_SQL = text(
+    """
+    DELETE FROM document_vectors AS d
+    USING unnest(CAST(:source_ids AS text[]), CAST(:chunk_counts AS integer[]))
+        AS t(source_id, chunk_count)
+    WHERE d.source_table = 'crew_job_event'
+      AND d.source_id = t.source_id
+      AND d.chunk_index >= t.chunk_count
+"""
+)
+
+# Rewrites the metadata of chunks kept from an earlier run of a changed event,
+# whose offsets and chunk count may have moved
+_RELABEL_CHUNKS_SQL = text(
+    """
+    UPDATE document_vectors AS d
+    SET metadata = t.metadata,
+        updated_at = NOW()
+    FROM unnest(
+        CAST(:source_ids AS text[]),
+        CAST(:chunk_indexes AS integer[]),
+        CAST(CAST(:metadatas AS text[]) AS jsonb[])
+    ) AS t(source_id, chunk_index, metadata)
+    WHERE d.source_table = 'crew_job_event'
+      AND d.source_id = t.source_id
+      AND d.chunk_index = t.chunk_index
+"""
+)
+
+# Candidate list size for HNSW search; scoped to the search transaction
+_SET_EF_SEARCH_SQL = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+
+# Runs directly on the asyncpg connection, so it uses positional parameters.
+# Embeddings are bound as vectors through the pgvector codec, or as text
+# literals cast server-side on connections where the codec isn't registered.
+_UPSERT_SQL_TEMPLATE = """
+    INSERT INTO document_vectors
+    (source_table, source_id, source_column, chunk_index,
+     chunk_text, embedding, metadata, content_hash)
+    SELECT * FROM unnest(
+        $1::text[],
+        $2::text[],
+        $3::text[],
+        $4::integer[],
+        $5::text[],
+        $6::{embedding_array},
+        $7::text[]::jsonb[],
+        $8::bytea[]
+    )
+    ON CONFLICT (source_table, source_id, chunk_index) DO UPDATE
+    SET chunk_text = EXCLUDED.chunk_text,
+        embedding = EXCLUDED.embedding,
+        metadata = EXCLUDED.metadata,
+        content_hash = EXCLUDED.content_hash,
+        updated_at = NOW()
+"""
+_UPSERT_SQL = _UPSERT_SQL_TEMPLATE.format(embedding_array="vector[]")
+_UPSERT_TEXT_VECTORS_SQL = _UPSERT_SQL_TEMPLATE.format(embedding_array="text[]::vector[]")
+
+
+def _vector_literal(embedding: np.ndarray) -> str:
+    """pgvector's text form of an embedding, for connections without the codec"""
+    return "[" + ",".join(map(str, embedding.tolist())) + "]"
+
+
+def _read_tokenizer(model_name: str):
+    """Load the tokenizer for an embedding model, blocking on any download"""
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # Not an OpenAI model; cl100k_base is a close enough token count
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _tokenizer_loaded(load: asyncio.Future) -> None:
+    """Keep the tokenizer once loaded, even if every caller stopped waiting"""
+    global _tokenizer
+    if load.cancelled():
+        return
+    if load.exception() is not None:
+        logger.warning("Tokenizer unavailable, chunking by characters: %s", load.exception())
+    else:
+        _tokenizer = load.result()
+
+
+async def load_tokenizer(model_name: str = EMBEDDING_MODEL):
+    """Load the chunking tokenizer in a worker thread and cache it for the process
+
+    tiktoken downloads its BPE file on first use with a blocking request and
+    no timeout, so the load never runs on the event loop and callers give up
+    after _TOKENIZER_LOAD_TIMEOUT. A load still running is waited on rather
+    than started again; a failed one is retried by the next caller.
+
+    Returns the tokenizer, or None if it is not available yet.
+    """
+    global _tokenizer_load
+    if _tokenizer is None:
+        if _tokenizer_load is None or _tokenizer_load.done():
+            _tokenizer_load = asyncio.ensure_future(
+                asyncio.to_thread(_read_tokenizer, model_name)
+            )
+            _tokenizer_load.add_done_callback(_tokenizer_loaded)
+        try:
+            # Shielded so a timeout leaves the download running for later jobs
+            return await asyncio.wait_for(
+                asyncio.shield(_tokenizer_load), _TOKENIZER_LOAD_TIMEOUT
+            )
+        except TimeoutError:
+            logger.warning(
+                "Tokenizer still loading after %ss, chunking by characters",
+                _TOKENIZER_LOAD_TIMEOUT,
+            )
+        except Exception:
+            # Already logged by _tokenizer_loaded
+            pass
+    return _tokenizer
+
+
 class VectorizationService:
     """Service for vectorizing documents and storing in PostgreSQL"""
 
     def __init__(self):
         # Use the new embedding client with provider switching
         self.embedding_client = EmbeddingClient()
-        self.max_chunk_size = 2000  # Characters per chunk
-        self.chunk_overlap = 200  # Overlap between chunks
+        self.chunk_tokens = 512  # Tokens per chunk window
+        self.chunk_stride = 384  # Tokens between window starts (75% of a window)
+        self.max_chunk_size = 2000  # Characters per chunk without a tokenizer
+        self.chunk_overlap = 200  # Overlap between character chunks
+        self.embedding_batch_size = 128  # Texts per embedding API call
+        self.embedding_concurrency = 4  # Embedding batches in flight at once
+        # Chunks per pipeline window; enough to fill every concurrent batch
+        self.pipeline_window_texts = self.embedding_batch_size * self.embedding_concurrency
+        # Shards written in parallel; stays within the direct engine's pool_size
+        self.write_concurrency = 4
 
     async def vectorize_job_events(
         self, job_id: str, events: List[Dict[str, Any]]
@@ -30,6 +234,24 @@ class VectorizationService:
         """
         Vectorize job events and store in document_vectors table
 
+        Chunking, embedding and writing run as a pipeline over windows of about
+        pipeline_window_texts chunks, so one window is being embedded while the
+        previous one is written. Bounded queues between the stages cap memory.
+
+        Writes are sharded by up to _COMMIT_EVERY_EVENTS events. Each shard is
+        written on its own pooled connection and committed as one transaction,
+        with up to write_concurrency shards in flight. Typical jobs are a single
+        shard, so they land in one transaction and one WAL flush. Very large jobs
+        write in parallel, and sharding bounds how long row locks are held and
+        how much work a failure rolls back; shards that finished stay committed.
+
+        Chunks whose content hash matches the stored row are neither embedded
+        nor written again, so re-runs only pay for chunks that changed. The
+        hash covers the embedding model, so switching models re-embeds
+        everything. When some of an event's chunks changed, the kept chunks
+        get their metadata rewritten and stored chunks past the event's new
+        chunk count are deleted.
+
         Args:
             job_id: The job ID
             events: List of event dictionaries from crew_job_event
@@ -39,206 +261,593 @@ class VectorizationService:
         """
         total_chunks = 0
         processed_events = 0
+        unchanged_chunks = 0
 
+        # Hashes of the chunks already stored for these events, keyed by
+        # (source_id, chunk_index)
         async with get_direct_session() as session:
+            stored_hashes = await self._load_content_hashes(session, events)
+
+        # Number of chunks stored per event, to find rows a re-chunk leaves behind
+        stored_counts: Dict[str, int] = {}
+        for source_id, chunk_index in stored_hashes:
+            if chunk_index >= stored_counts.get(source_id, 0):
+                stored_counts[source_id] = chunk_index + 1
+        # (source_id, new chunk count) of events with rows past their last chunk
+        trailing: List[Tuple[str, int]] = []
+        # (source_id, chunk_index, metadata) of kept chunks of changed events
+        relabels: List[Tuple[str, int, str]] = []
+
+        hasher = self._content_hasher()
+
+        encoding = await load_tokenizer(self.embedding_client.model_name)
+
+        chunked: asyncio.Queue = asyncio.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+        embedded: asyncio.Queue = asyncio.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+
+        async def produce() -> None:
+            # Chunk events into windows sized to fill the embedding batches
+            nonlocal unchanged_chunks
+            window = []
+            window_texts = 0
             try:
-                # Process each event
                 for event in events:
-                    event_id = event.get("id")
-                    if not event_id:
+                    if not event.get("id"):
                         continue
 
-                    # Create text representation of event
-                    event_text = self._create_event_text(event)
-
-                    # Chunk the text if needed
-                    chunks = self._chunk_text(event_text)
-
-                    # Get embeddings for all chunks
-                    embeddings = await self._get_embeddings(
-                        [chunk["text"] for chunk in chunks]
+                    # Create text representation of event and chunk it if needed
+                    starts, ends, texts = self._chunk_text(
+                        self._create_event_text(event), encoding
                     )
-
-                    # Store each chunk with its embedding
-                    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                        # Check if this chunk already exists
-                        existing = await session.execute(
-                            select(text("1"))
-                            .where(
-                                text(
-                                    """
-                                    source_table = :source_table 
-                                    AND source_id = :source_id 
-                                    AND chunk_index = :chunk_index
-                                """
-                                )
-                            )
-                            .params(
-                                source_table="crew_job_event",
-                                source_id=event_id,
-                                chunk_index=i,
+                    total = len(texts)
+                    source_id = str(event["id"])
+                    stored_count = stored_counts.get(source_id, 0)
+                    if stored_count > total:
+                        trailing.append((source_id, total))
+
+                    # Keep only chunks that are new or whose text changed
+                    hashes = [
+                        self._content_hash(hasher, chunk_text) for chunk_text in texts
+                    ]
+                    changed = [
+                        i
+                        for i, content_hash in enumerate(hashes)
+                        if stored_hashes.get((source_id, i)) != content_hash
+                    ]
+                    unchanged_chunks += total - len(changed)
+                    if len(changed) < total and (changed or stored_count != total):
+                        relabels.extend(
+                            self._build_relabels(
+                                job_id, event, total, changed, starts, ends
                             )
                         )
+                    if not changed:
+                        continue
+                    if len(changed) < total:
+                        starts, ends = starts[changed], ends[changed]
+                        texts = [texts[i] for i in changed]
+                        hashes = [hashes[i] for i in changed]
+
+                    window.append((event, total, changed, starts, ends, texts, hashes))
+                    window_texts += len(texts)
+                    if window_texts >= self.pipeline_window_texts:
+                        await chunked.put(window)
+                        window = []
+                        window_texts = 0
+                if window:
+                    await chunked.put(window)
+            except Exception:
+                # Still end the stream so the next stage stops; the error is
+                # raised when the writer awaits this task
+                await chunked.put(None)
+                raise
+            await chunked.put(None)
 
-                        if existing.scalar():
-                            # Update existing
-                            await session.execute(
-                                text(
-                                    """
-                                    UPDATE document_vectors 
-                                    SET chunk_text = :chunk_text,
-                                        embedding = :embedding,
-                                        metadata = :metadata,
-                                        updated_at = NOW()
-                                    WHERE source_table = :source_table 
-                                      AND source_id = :source_id 
-                                      AND chunk_index = :chunk_index
-                                """
-                                ),
-                                {
-                                    "source_table": "crew_job_event",
-                                    "source_id": event_id,
-                                    "chunk_index": i,
-                                    "chunk_text": chunk["text"],
-                                    "embedding": embedding,
-                                    "metadata": json.dumps(
-                                        {
-                                            "job_id": job_id,
-                                            "event_type": event.get("event_type"),
-                                            "event_time": event.get("created_at"),
-                                            "chunk_start": chunk["start"],
-                                            "chunk_end": chunk["end"],
-                                            "total_chunks": len(chunks),
-                                            "model": self.embedding_client.model_name,
-                                        }
-                                    ),
-                                },
-                            )
-                        else:
-                            # Insert new
-                            await session.execute(
-                                text(
-                                    """
-                                    INSERT INTO document_vectors 
-                                    (source_table, source_id, source_column, chunk_index, 
-                                     chunk_text, embedding, metadata)
-                                    VALUES 
-                                    (:source_table, :source_id, :source_column, :chunk_index,
-                                     :chunk_text, :embedding, :metadata)
-                                """
-                                ),
-                                {
-                                    "source_table": "crew_job_event",
-                                    "source_id": event_id,
-                                    "source_column": "event_data",
-                                    "chunk_index": i,
-                                    "chunk_text": chunk["text"],
-                                    "embedding": embedding,
-                                    "metadata": json.dumps(
-                                        {
-                                            "job_id": job_id,
-                                            "event_type": event.get("event_type"),
-                                            "event_time": event.get("created_at"),
-                                            "chunk_start": chunk["start"],
-                                            "chunk_end": chunk["end"],
-                                            "total_chunks": len(chunks),
-                                            "model": self.embedding_client.model_name,
-                                        }
-                                    ),
-                                },
+        async def embed() -> None:
+            try:
+                while (window := await chunked.get()) is not None:
+                    texts = [
+                        chunk_text
+                        for *_, chunk_texts, _ in window
+                        for chunk_text in chunk_texts
+                    ]
+                    await embedded.put((window, await self._get_embeddings(texts)))
+            except Exception:
+                await embedded.put(None)
+                raise
+            await embedded.put(None)
+
+        producer = asyncio.create_task(produce())
+        embedder = asyncio.create_task(embed())
+
+        try:
+            # Fresh jobs are bulk loaded with COPY; re-runs go through the UPSERT
+            use_copy = not stored_hashes
+
+            write_slots = asyncio.Semaphore(self.write_concurrency)
+            async with asyncio.TaskGroup() as shards:
+                shard = None
+                while (item := await embedded.get()) is not None:
+                    if shard is None:
+                        # Each shard writes on its own connection; waiting for a
+                        # free slot applies backpressure to the pipeline
+                        await write_slots.acquire()
+                        shard = asyncio.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+                        shards.create_task(self._write_shard(shard, use_copy, write_slots))
+                        shard_events = 0
+
+                    window, window_embeddings = item
+                    records = []
+                    offset = 0
+                    for event, total, indexes, starts, ends, texts, hashes in window:
+                        records.extend(
+                            self._build_records(
+                                job_id,
+                                event,
+                                total,
+                                indexes,
+                                starts,
+                                ends,
+                                texts,
+                                hashes,
+                                window_embeddings[offset : offset + len(texts)],
                             )
+                        )
+                        offset += len(texts)
+                    await shard.put(records)
 
-                        total_chunks += 1
-
-                    processed_events += 1
+                    total_chunks += offset
+                    processed_events += len(window)
+                    shard_events += len(window)
 
-                    # Commit periodically
-                    if processed_events % 10 == 0:
-                        await session.commit()
+                    # Close the shard, committing it, once it holds enough events
+                    if shard_events >= _COMMIT_EVERY_EVENTS:
+                        await shard.put(None)
+                        shard = None
                         logger.info(
                             f"Processed {processed_events}/{len(events)} events"
                         )
 
-                # Final commit
+                # The stages end early on failure; surface their errors before
+                # the last shard commits. The producer has finished once the
+                # embedder has.
+                await embedder
+                await producer
+
+                if shard is not None:
+                    await shard.put(None)
+
+            if trailing or relabels:
+                await self._reconcile_kept_chunks(trailing, relabels)
+
+            return {
+                "total_events": len(events),
+                "processed_events": processed_events,
+                "total_chunks": total_chunks,
+                "unchanged_chunks": unchanged_chunks,
+                "avg_chunks_per_event": (
+                    total_chunks / processed_events if processed_events > 0 else 0
+                ),
+            }
+
+        except ExceptionGroup as eg:
+            # Report the failing shard's error rather than the group wrapper
+            logger.error(f"Vectorization failed: {eg.exceptions[0]}")
+            raise eg.exceptions[0]
+        except Exception as e:
+            logger.error(f"Vectorization failed: {e}")
+            raise
+        finally:
+            producer.cancel()
+            embedder.cancel()
+
+    async def _write_shard(
+        self, shard: asyncio.Queue, use_copy: bool, write_slots: asyncio.Semaphore
+    ) -> None:
+        """Write one shard's record batches on its own session and commit them
+
+        Shards hold disjoint events, so their rows never conflict. A failed
+        shard rolls back only its own events.
+        """
+        try:
+            async with get_direct_session() as session:
+                while (records := await shard.get()) is not None:
+                    await self._write_records(session, records, use_copy)
                 await session.commit()
+        finally:
+            write_slots.release()
 
-                return {
-                    "total_events": len(events),
-                    "processed_events": processed_events,
-                    "total_chunks": total_chunks,
-                    "avg_chunks_per_event": (
-                        total_chunks / processed_events if processed_events > 0 else 0
-                    ),
-                }
-
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"Vectorization failed: {e}")
-                raise
+    def _build_records(
+        self,
+        job_id: str,
+        event: Dict[str, Any],
+        total_chunks: int,
+        chunk_indexes: List[int],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        texts: List[str],
+        hashes: List[bytes],
+        embeddings: np.ndarray,
+    ) -> List[tuple]:
+        """Build records in COPY_COLUMNS order for an event's changed chunks"""
+        source_id = str(event["id"])
+        metadata_prefix = self._metadata_prefix(job_id, event, total_chunks)
+
+        return [
+            (
+                "crew_job_event",
+                source_id,
+                "event_data",
+                chunk_index,
+                chunk_text,
+                embedding,
+                self._chunk_metadata(metadata_prefix, start, end),
+                content_hash,
+            )
+            for chunk_index, start, end, chunk_text, content_hash, embedding in zip(
+                chunk_indexes, starts.tolist(), ends.tolist(), texts, hashes, embeddings
+            )
+        ]
+
+    def _build_relabels(
+        self,
+        job_id: str,
+        event: Dict[str, Any],
+        total_chunks: int,
+        changed: List[int],
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> List[Tuple[str, int, str]]:
+        """Build (source_id, chunk_index, metadata) for an event's unchanged chunks"""
+        source_id = str(event["id"])
+        metadata_prefix = self._metadata_prefix(job_id, event, total_chunks)
+
+        kept = np.ones(total_chunks, dtype=bool)
+        kept[changed] = False
+        kept_indexes = np.flatnonzero(kept)
+        return [
+            (source_id, chunk_index, self._chunk_metadata(metadata_prefix, start, end))
+            for chunk_index, start, end in zip(
+                kept_indexes.tolist(),
+                starts[kept_indexes].tolist(),
+                ends[kept_indexes].tolist(),
+            )
+        ]
+
+    def _metadata_prefix(
+        self, job_id: str, event: Dict[str, Any], total_chunks: int
+    ) -> bytes:
+        """Encode an event's chunk metadata once, minus the closing brace"""
+        return orjson.dumps(
+            {
+                "job_id": job_id,
+                "event_type": event.get("event_type"),
+                "event_time": event.get("created_at"),
+                "total_chunks": total_chunks,
+                "model": self.embedding_client.model_name,
+            },
+            option=_ORJSON_OPTIONS,
+        )[:-1]
+
+    @staticmethod
+    def _chunk_metadata(metadata_prefix: bytes, start: int, end: int) -> str:
+        """Splice a chunk's offsets onto its event's metadata prefix"""
+        return (
+            metadata_prefix + b',"chunk_start":%d,"chunk_end":%d}' % (start, end)
+        ).decode()
+
+    def _content_hasher(self):
+        """BLAKE2b state seeded with the embedding model, copied per chunk
+
+        Vectors from different models aren't comparable (and may differ in
+        dimension), so a chunk only counts as unchanged for the same model.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(self.embedding_client.model_name.encode())
+        hasher.update(b"\0")
+        return hasher
+
+    @staticmethod
+    def _content_hash(hasher, chunk_text: str) -> bytes:
+        """128-bit digest of the model and a chunk's text, stored to detect unchanged chunks"""
+        hasher = hasher.copy()
+        hasher.update(chunk_text.encode())
+        return hasher.digest()
+
+    async def _load_content_hashes(
+        self, session, events: List[Dict[str, Any]]
+    ) -> Dict[Tuple[str, int], Optional[bytes]]:
+        """Load the stored content hash of every chunk of the given events"""
+        source_ids = [str(event["id"]) for event in events if event.get("id")]
+        if not source_ids:
+            return {}
+
+        result = await session.execute(
+            _CONTENT_HASHES_SQL, {"source_ids": source_ids}
+        )
+        return {
+            (row.source_id, row.chunk_index): row.content_hash for row in result
+        }
+
+    async def _reconcile_kept_chunks(
+        self,
+        trailing: List[Tuple[str, int]],
+        relabels: List[Tuple[str, int, str]],
+    ) -> None:
+        """Delete chunks past each event's new chunk count and relabel kept ones"""
+        async with get_direct_session() as session:
+            if trailing:
+                source_ids, chunk_counts = zip(*trailing)
+                await session.execute(
+                    _DELETE_TRAILING_CHUNKS_SQL,
+                    {"source_ids": list(source_ids), "chunk_counts": list(chunk_counts)},
+                )
+            if relabels:
+                source_ids, chunk_indexes, metadatas = zip(*relabels)
+                await session.execute(
+                    _RELABEL_CHUNKS_SQL,
+                    {
+                        "source_ids": list(source_ids),
+                        "chunk_indexes": list(chunk_indexes),
+                        "metadatas": list(metadatas),
+                    },
+                )
+            await session.commit()
+        logger.info(
+            f"Deleted trailing chunks of {len(trailing)} events, "
+            f"relabeled {len(relabels)} kept chunks"
+        )
+
+    async def _write_records(
+        self, session, records: List[tuple], use_copy: bool
+    ) -> None:
+        """Write buffered chunk records with COPY or a single UPSERT statement
+
+        Binary COPY can't encode vectors without the pgvector codec, so such
+        connections always write through the text-literal UPSERT.
+        """
+        if not records:
+            return
+        driver_connection, binary_vectors = await self._driver_connection(session)
+        if use_copy and binary_vectors:
+            await self._copy_records(driver_connection, records)
+        else:
+            await self._upsert_records(driver_connection, records, binary_vectors)
+
+    async def _upsert_records(
+        self, driver_connection, records: List[tuple], binary_vectors: bool
+    ) -> None:
+        """UPSERT chunk records as column arrays expanded server-side with unnest
+
+        The statement is sent on the session's asyncpg connection, inside the
+        session's transaction, to skip SQLAlchemy's per-execute overhead.
+
+        Each embedding is bound as a pgvector Vector. asyncpg treats any sized
+        iterable in an array parameter as a nested dimension, so bare NumPy
+        rows would be sent as a 2-D float array instead of a vector[]. Without
+        the codec, embeddings are sent as text literals instead.
+        """
+        (
+            source_tables,
+            source_ids,
+            source_columns,
+            chunk_indexes,
+            chunk_texts,
+            embeddings,
+            metadatas,
+            content_hashes,
+        ) = zip(*records)
+
+        if binary_vectors:
+            sql = _UPSERT_SQL
+            bound_embeddings = [Vector(embedding) for embedding in embeddings]
+        else:
+            sql = _UPSERT_TEXT_VECTORS_SQL
+            bound_embeddings = [_vector_literal(embedding) for embedding in embeddings]
+
+        await driver_connection.execute(
+            sql,
+            list(source_tables),
+            list(source_ids),
+            list(source_columns),
+            list(chunk_indexes),
+            list(chunk_texts),
+            bound_embeddings,
+            list(metadatas),
+            list(content_hashes),
+        )
+
+    async def _copy_records(self, driver_connection, records: List[tuple]) -> None:
+        """Bulk load rows with COPY FROM STDIN on the session's asyncpg connection"""
+        # Binary COPY encodes the embedding column with the pgvector codec
+        # registered on every connection in database.connection
+        await driver_connection.copy_records_to_table(
+            "document_vectors",
+            records=records,
+            columns=list(COPY_COLUMNS),
+        )
+
+    async def _driver_connection(self, session) -> Tuple[Any, bool]:
+        """Return the asyncpg connection behind the session's current transaction
+
+        Also returns whether pgvector's codec is registered on it, as recorded
+        by database.connection when the connection was opened.
+        """
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return (
+            raw_connection.driver_connection,
+            raw_connection.info.get(VECTOR_CODEC_KEY, False),
+        )
 
     def _create_event_text(self, event: Dict[str, Any]) -> str:
         """Create searchable text representation of an event"""
         parts = []
+        append = parts.append
 
         # Add event type
-        parts.append(f"Event Type: {event.get('event_type', 'unknown')}")
+        append(f"Event Type: {event.get('event_type', 'unknown')}")
 
         # Add timestamp
         if event.get("created_at"):
-            parts.append(f"Time: {event['created_at']}")
+            append(f"Time: {event['created_at']}")
 
-        # Process event data
+        # Process event data (decoded JSON, so exact type checks suffice)
         event_data = event.get("event_data", {})
-        if isinstance(event_data, dict):
+        if type(event_data) is dict:
             for key, value in event_data.items():
-                if key in ["message", "thought", "action", "observation", "error"]:
-                    # Important fields get full text
-                    parts.append(f"{key}: {value}")
-                elif isinstance(value, (str, int, float, bool)):
-                    # Simple values
-                    parts.append(f"{key}: {value}")
-                elif isinstance(value, dict):
-                    # Complex objects get summarized
-                    parts.append(f"{key}: {json.dumps(value)[:200]}...")
+                value_type = type(value)
+                if key in _IMPORTANT_EVENT_KEYS or value_type in _SIMPLE_TYPES:
+                    # Important fields get full text, as do simple values
+                    append(f"{key}: {value}")
+                elif value_type is dict:
+                    # Complex objects get summarized to their first 200 characters
+                    summary = orjson.dumps(value, option=_ORJSON_OPTIONS).decode()
+                    append(f"{key}: {summary[:200]}...")
 
         return "\n".join(parts)
 
-    def _chunk_text(self, text: str) -> List[Dict[str, Any]]:
-        """Split text into overlapping chunks"""
+    def _chunk_text(self, text: str, encoding=None) -> Chunks:
+        """Split text into overlapping windows of chunk_tokens tokens
+
+        Windows start every chunk_stride tokens. Chunk text is sliced from the
+        original string at token boundaries, so starts/ends are character
+        offsets. Returns parallel (starts, ends, texts) arrays. Without an
+        encoding (see load_tokenizer), text is chunked by characters.
+        """
+        if encoding is None:
+            return self._chunk_text_by_characters(text)
+
+        tokens = encoding.encode(text, disallowed_special=())
+        token_count = len(tokens)
+        if token_count <= self.chunk_tokens:
+            return self._single_chunk(text)
+
+        # Character offset of each token, so a window never splits a character,
+        # plus the end of the text for the final window
+        _, offsets = encoding.decode_with_offsets(tokens)
+        offsets = np.asarray(offsets + [len(text)], dtype=np.int32)
+
+        # A window is needed until the previous one reaches the last token
+        window_starts = np.arange(
+            0, token_count - self.chunk_tokens + self.chunk_stride, self.chunk_stride
+        )
+        starts = offsets[window_starts]
+        ends = offsets[np.minimum(window_starts + self.chunk_tokens, token_count)]
+        texts = [text[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+        return starts, ends, texts
+
+    @staticmethod
+    def _single_chunk(text: str) -> Chunks:
+        """Chunk arrays for text that fits in one chunk"""
+        return (
+            np.array([0], dtype=np.int32),
+            np.array([len(text)], dtype=np.int32),
+            [text],
+        )
+
+    def _chunk_text_by_characters(self, text: str) -> Chunks:
+        """Split text into overlapping chunks of max_chunk_size characters"""
         if len(text) <= self.max_chunk_size:
-            return [{"text": text, "start": 0, "end": len(text)}]
+            return self._single_chunk(text)
+
+        # Locate every newline and space once; each chunk then binary-searches
+        # its window. UTF-32 gives one array element per character, so array
+        # positions are string offsets even for non-ASCII text.
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype="<u4")
+        newlines = np.flatnonzero(codepoints == 0x0A)
+        spaces = np.flatnonzero(codepoints == 0x20)
 
-        chunks = []
+        starts, ends, texts = [], [], []
         start = 0
+        text_length = len(text)
 
-        while start < len(text):
+        while start < text_length:
             # Find end position
             end = start + self.max_chunk_size
 
             # Try to break at a newline or space
-            if end < len(text):
+            if end < text_length:
+                window_start = start + self.chunk_overlap
                 # Look for newline first
-                newline_pos = text.rfind("\n", start + self.chunk_overlap, end)
-                if newline_pos > start:
-                    end = newline_pos + 1
-                else:
+                break_pos = self._last_position_in(newlines, window_start, end)
+                if break_pos < 0:
                     # Look for space
-                    space_pos = text.rfind(" ", start + self.chunk_overlap, end)
-                    if space_pos > start:
-                        end = space_pos + 1
+                    break_pos = self._last_position_in(spaces, window_start, end)
+                if break_pos > start:
+                    end = break_pos + 1
 
-            chunks.append({"text": text[start:end], "start": start, "end": end})
+            starts.append(start)
+            ends.append(end)
+            texts.append(text[start:end])
 
             # Move start position (with overlap)
             start = end - self.chunk_overlap
-            if start >= len(text):
+            if start >= text_length:
                 break
 
-        return chunks
+        return (
+            np.asarray(starts, dtype=np.int32),
+            np.asarray(ends, dtype=np.int32),
+            texts,
+        )
+
+    @staticmethod
+    def _last_position_in(positions: np.ndarray, low: int, high: int) -> int:
+        """Return the last sorted position p with low <= p < high, or -1"""
+        idx = int(np.searchsorted(positions, high)) - 1
+        if idx >= 0 and positions[idx] >= low:
+            return int(positions[idx])
+        return -1
+
+    async def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings using the configured provider (OpenAI or custom)
+
+        Identical texts (repeated heartbeats, boilerplate errors) are embedded
+        once and the result is copied to every position they appear in.
+        Returns a float32 array of shape (N, dimension) in input order.
+        """
+        # Position of each text in the list of unique texts
+        unique_texts: Dict[str, int] = {}
+        positions = [unique_texts.setdefault(text, len(unique_texts)) for text in texts]
+        if len(unique_texts) == len(texts):
+            return await self._request_embeddings(texts)
+
+        unique_embeddings = await self._request_embeddings(list(unique_texts))
+        return unique_embeddings[positions]
+
+    async def _request_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Request embeddings for texts from the embedding provider
 
-    async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings using the configured provider (OpenAI or custom)"""
-        return await self.embedding_client.get_embeddings(texts)
+        Texts are sent in batches of at most embedding_batch_size, with up to
+        embedding_concurrency batches in flight at once. Results are returned
+        in input order as one contiguous float32 array of shape (N, dimension).
+        """
+        batches = [
+            texts[i : i + self.embedding_batch_size]
+            for i in range(0, len(texts), self.embedding_batch_size)
+        ]
+        if not batches:
+            return np.empty((0, EMBEDDING_DIMENSION), dtype=np.float32)
+        if len(batches) == 1:
+            return np.asarray(
+                await self.embedding_client.get_embeddings(texts), dtype=np.float32
+            )
+
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                # Small jitter so concurrent batches don't hit rate limits in lockstep
+                await asyncio.sleep(random.uniform(0, 0.05))
+                return await self.embedding_client.get_embeddings(batch)
+
+        # gather preserves the order of the batches
+        results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        return np.concatenate(
+            [np.asarray(batch_embeddings, dtype=np.float32) for batch_embeddings in results]
+        )
 
     async def search_similar(
         self,
@@ -254,7 +863,7 @@ class VectorizationService:
             query: Search query text
             source_table: Optional filter by source table
             limit: Maximum results to return
-            metadata_filter: Optional JSONB metadata filters
+            metadata_filter: Optional JSONB metadata filters, matched by containment
 
         Returns:
             List of similar documents with scores
@@ -267,34 +876,33 @@ class VectorizationService:
         query_embedding = embeddings[0]
 
         async with get_direct_session() as session:
-            # Build query
-            sql = """
-                SELECT 
-                    id,
-                    source_table,
-                    source_id,
-                    chunk_index,
-                    chunk_text,
-                    metadata,
-                    1 - (embedding <=> :embedding::vector) as similarity
-                FROM document_vectors
-                WHERE 1=1
-            """
-
-            params = {"embedding": query_embedding, "limit": limit}
-
-            if source_table:
-                sql += " AND source_table = :source_table"
-                params["source_table"] = source_table
-
-            if metadata_filter:
-                for key, value in metadata_filter.items():
-                    sql += f" AND metadata->'{key}' = :meta_{key}"
-                    params[f"meta_{key}"] = json.dumps(value)
-
-            sql += " ORDER BY embedding <=> :embedding::vector LIMIT :limit"
-
-            result = await session.execute(text(sql), params)
+            _, binary_vectors = await self._driver_connection(session)
+
+            # Widen the HNSW candidate list for larger result sets so the
+            # index scan still returns `limit` rows after filtering
+            await session.execute(
+                _SET_EF_SEARCH_SQL, {"ef_search": str(max(40, limit * 4))}
+            )
+
+            result = await session.execute(
+                _SEARCH_SQL,
+                {
+                    # Sent in pgvector's binary format via the connection codec,
+                    # or as a text literal where the codec isn't registered
+                    "embedding": (
+                        np.asarray(query_embedding, dtype=np.float32)
+                        if binary_vectors
+                        else _vector_literal(np.asarray(query_embedding, dtype=np.float32))
+                    ),
+                    "source_table": source_table or None,
+                    "metadata_filter": (
+                        orjson.dumps(metadata_filter, option=_ORJSON_OPTIONS).decode()
+                        if metadata_filter
+                        else None
+                    ),
+                    "limit": limit,
+                },
+            )
 
             return [
                 {
@@ -0,0 +1,54 @@
+"""
+Helpers shared by the book ingestion API test scripts.
+
+Only the standard library and httpx are imported here, so pulling these
+helpers into a script costs nothing beyond what the script already loads.
+"""
+
+import asyncio
+import random
+import socket
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+# Connection pool shared by every request in a run
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+# Fail fast on a dead server while still allowing slow job responses
+HTTP_TIMEOUT = httpx.Timeout(connect=2.0, read=30.0, write=5.0, pool=1.0)
+
+# Last formatted wall-clock second, reused for status lines within that second
+_clock_second = -1
+_clock_text = ""
+
+
+def make_client(timeout: httpx.Timeout = HTTP_TIMEOUT, limits: httpx.Limits = HTTP_LIMITS) -> httpx.AsyncClient:
+    """Create the pooled HTTP/2 client a script reuses for all its requests."""
+    return httpx.AsyncClient(timeout=timeout, http2=True, limits=limits)
+
+
+def api_port_open(base_url: str, timeout: float = 0.2) -> bool:
+    """Check that something is listening on the API port before using HTTP."""
+    url = urlsplit(base_url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    with socket.socket() as sock:
+        sock.settimeout(timeout)
+        return sock.connect_ex((url.hostname, port)) == 0
+
+
+async def backoff_sleep(interval: float, ceiling: float, factor: float) -> float:
+    """Sleep for the interval plus up to 30% jitter and return the next interval."""
+    await asyncio.sleep(interval + random.uniform(0, 0.3 * interval))
+    return min(ceiling, interval * factor)
+
+
+def clock_time() -> str:
+    """Return the local time as HH:MM:SS, formatting at most once per second."""
+    global _clock_second, _clock_text
+    second = int(time.time())
+    if second != _clock_second:
+        _clock_second = second
+        _clock_text = time.strftime("%H:%M:%S", time.localtime(second))
+    return _clock_text
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
 Standalone test of book ingestion crew.
-Runs the crew's main.py directly.
+Runs the crew's main.py in this interpreter instead of a child process.
 """
 
-import subprocess
+import importlib.util
 import sys
 import os
-import json
+import threading
 
 # Test configuration
 TEST_ARGS = [
@@ -16,6 +16,7 @@ TEST_ARGS = [
     "--google_drive_folder_path", "sparkjar/vervelyn/castor gonzalez/book 1/",
     "--language", "es"
 ]
+CREW_TIMEOUT_SECONDS = 300  # 5 minute timeout
 
 def run_crew_standalone():
     """Run the book ingestion crew standalone."""
@@ -28,37 +29,54 @@ def run_crew_standalone():
         print(f"❌ Error: {crew_main} not found")
         return
     
-    print(f"\n📚 Running: python3 {crew_main} {' '.join(TEST_ARGS[:5])}...")
+    print(f"\n📚 Running: {crew_main} {' '.join(TEST_ARGS[:5])}...")
     print(f"   Additional args: {' '.join(TEST_ARGS[5:])}")
     
+    saved_argv = sys.argv
     try:
-        # Run the crew directly
-        cmd = ["python3", crew_main] + TEST_ARGS
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        # main.py imports its siblings (`from crew import kickoff`), so put its
+        # directory first on the path as `python3 main.py` would
+        sys.path.insert(0, os.path.dirname(os.path.abspath(crew_main)))
+        spec = importlib.util.spec_from_file_location("book_ingestion_crew_main", crew_main)
+        crew_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(crew_module)
+        
+        # main() parses sys.argv itself
+        sys.argv = [crew_main] + TEST_ARGS
         
         print("\n📊 Output:")
         print("-" * 60)
-        if result.stdout:
-            print(result.stdout)
         
-        if result.stderr:
-            print("\n⚠️  Errors/Warnings:")
-            print(result.stderr)
+        # main() runs on a daemon thread so the timeout can abandon it; the
+        # thread ends with the interpreter
+        outcome = {}
+        
+        def run_main():
+            try:
+                crew_module.main()
+                outcome["code"] = 0
+            except SystemExit as e:
+                outcome["code"] = e.code
+            except Exception as e:
+                outcome["error"] = e
+        
+        crew_thread = threading.Thread(target=run_main, daemon=True)
+        crew_thread.start()
+        crew_thread.join(CREW_TIMEOUT_SECONDS)
         
-        if result.returncode == 0:
+        if crew_thread.is_alive():
+            print("\n⚠️  Execution timed out after 5 minutes")
+        elif "error" in outcome:
+            print(f"\n❌ Error running crew: {outcome['error']}")
+        elif outcome["code"] in (0, None):
             print("\n✅ Crew execution completed successfully!")
         else:
-            print(f"\n❌ Crew execution failed with code: {result.returncode}")
+            print(f"\n❌ Crew execution failed with code: {outcome['code']}")
             
-    except subprocess.TimeoutExpired:
-        print("\n⚠️  Execution timed out after 5 minutes")
     except Exception as e:
         print(f"\n❌ Error running crew: {str(e)}")
+    finally:
+        sys.argv = saved_argv
 
 if __name__ == "__main__":
     run_crew_standalone()
\ No newline at end of file
@@ -15,9 +15,6 @@ load_dotenv()
 crew_api_src = os.path.join(os.getcwd(), "services", "crew-api", "src")
 sys.path.insert(0, crew_api_src)
 
-# Now we can import from the crew
-from crews.book_ingestion_crew.crew import kickoff
-
 # Load the request data
 with open('book_ingestion_request.json', 'r') as f:
     request = json.load(f)
@@ -39,6 +36,9 @@ try:
     print("\n📊 Starting crew execution...")
     print("Processing first 25 pages from Google Drive...\n")
     
+    # Imported here so the crew's dependencies load only when it runs
+    from crews.book_ingestion_crew.crew import kickoff
+    
     # Run the crew
     result = kickoff(request_data)
     
@@ -14,9 +14,6 @@ load_dotenv()
 crew_api_src = os.path.join(os.getcwd(), "services", "crew-api", "src")
 sys.path.insert(0, crew_api_src)
 
-# Import the handler
-from crews.book_ingestion_crew.book_ingestion_crew_handler import BookIngestionCrewHandler
-
 # Load request data
 with open('book_ingestion_request.json', 'r') as f:
     request = json.load(f)
@@ -36,6 +33,9 @@ async def run_test():
     """Run the crew handler test."""
     try:
         print("\n📊 Initializing crew handler...")
+        # Imported here so the crew's dependencies load only when it runs
+        from crews.book_ingestion_crew.book_ingestion_crew_handler import BookIngestionCrewHandler
+        
         handler = BookIngestionCrewHandler()
         
         print("🔧 Executing crew...")
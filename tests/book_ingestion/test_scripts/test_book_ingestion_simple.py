@@ -4,18 +4,33 @@ Test script for book ingestion crew.
 Tests the OCR processing of manuscript pages.
 """
 
+import asyncio
 import os
 import sys
-import requests
+import tempfile
+import httpx
 import time
-import json
 import jwt
+import orjson
 from datetime import datetime, timedelta, UTC
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _common import api_port_open, backoff_sleep, make_client
+
 # Test configuration
 API_URL = "http://localhost:8000"
 API_SECRET_KEY = os.getenv("API_SECRET_KEY", "test-secret-key-for-development")
 
+# Tokens are cached on disk and reused until they are close to expiring
+TOKEN_CACHE_FILE = os.path.join(tempfile.gettempdir(), "sparkjar_test_token.jwt")
+TOKEN_MIN_REMAINING_SECONDS = 300
+
+# Status polling starts fast and backs off towards the ceiling
+POLL_INITIAL_INTERVAL = 0.5
+POLL_MAX_INTERVAL = 5
+POLL_BACKOFF = 1.7
+
 # Test values provided by user
 TEST_DATA = {
     "client_user_id": "3a411a30-1653-4caf-acee-de257ff50e36",
@@ -32,35 +47,57 @@ TEST_DATA = {
 
 
 def generate_test_token():
-    """Generate a JWT token for testing."""
+    """Generate a JWT token for testing, reusing a cached one when valid."""
+    try:
+        with open(TOKEN_CACHE_FILE) as f:
+            token = f.read().strip()
+        # Verifying against the current key drops tokens signed with an old one
+        claims = jwt.decode(token, API_SECRET_KEY, algorithms=["HS256"])
+        if (
+            claims.get("sub") == "test_user"
+            and claims.get("scopes") == ["sparkjar_internal"]
+            and claims["exp"] > time.time() + TOKEN_MIN_REMAINING_SECONDS
+        ):
+            return token
+    except (OSError, KeyError, jwt.PyJWTError):
+        pass
+    
     payload = {
         "sub": "test_user",
         "scopes": ["sparkjar_internal"],
         "exp": datetime.now(UTC) + timedelta(hours=1)
     }
-    return jwt.encode(payload, API_SECRET_KEY, algorithm="HS256")
+    token = jwt.encode(payload, API_SECRET_KEY, algorithm="HS256")
+    try:
+        with open(TOKEN_CACHE_FILE, "w") as f:
+            f.write(token)
+    except OSError:
+        pass
+    return token
 
 
-def test_api_connection(token):
+async def test_api_connection(client):
     """Test if API is accessible."""
     print("Testing API connection...")
+    # Fail fast when the API is down instead of waiting on the HTTP timeout
+    if not api_port_open(API_URL):
+        print("❌ Cannot connect to API. Is it running?")
+        return False
     try:
-        response = requests.get(
-            f"{API_URL}/health",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        # /health is unauthenticated, so this can run before the token exists
+        response = await client.get(f"{API_URL}/health")
         if response.status_code == 200:
             print("✅ API is accessible")
             return True
         else:
             print(f"❌ API returned status {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ Cannot connect to API. Is it running?")
         return False
 
 
-def create_book_ingestion_job(token):
+async def create_book_ingestion_job(client, token):
     """Create a book ingestion job."""
     print("\n📚 Creating book ingestion job...")
     
@@ -69,17 +106,20 @@ def create_book_ingestion_job(token):
         "request_data": TEST_DATA
     }
     
-    print(f"Request payload: {json.dumps(payload, indent=2)}")
+    print(f"Request payload: {orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()}")
     
     try:
-        response = requests.post(
+        response = await client.post(
             f"{API_URL}/crew_job",
-            json=payload,
-            headers={"Authorization": f"Bearer {token}"}
+            content=orjson.dumps(payload),
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json"
+            }
         )
         
         if response.status_code == 200:
-            job_data = response.json()
+            job_data = orjson.loads(response.content)
             print(f"✅ Job created successfully!")
             print(f"   Job ID: {job_data['job_id']}")
             print(f"   Status: {job_data['status']}")
@@ -94,22 +134,24 @@ def create_book_ingestion_job(token):
         return None
 
 
-def poll_job_status(job_id, token, max_wait_minutes=10):
+async def poll_job_status(client, job_id, token, max_wait_minutes=10):
     """Poll job status until completion."""
     print(f"\n⏳ Monitoring job {job_id}...")
     
     start_time = time.time()
     max_wait_seconds = max_wait_minutes * 60
+    interval = POLL_INITIAL_INTERVAL
+    
+    url = f"{API_URL}/crew_job/{job_id}"
+    headers = {"Authorization": f"Bearer {token}"}
     
     while True:
         try:
-            response = requests.get(
-                f"{API_URL}/crew_job/{job_id}",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+            # Polls only need the status, so leave out the result and events
+            response = await client.get(url, headers=headers, params={"status_only": "true"})
             
             if response.status_code == 200:
-                job_data = response.json()
+                job_data = orjson.loads(response.content)
                 status = job_data['status']
                 
                 # Calculate elapsed time
@@ -119,6 +161,12 @@ def poll_job_status(job_id, token, max_wait_minutes=10):
                 # Display status
                 print(f"\r   Status: {status} (elapsed: {elapsed_str})", end="", flush=True)
                 
+                if status in ("completed", "failed"):
+                    # Fetch the full record once for display_results
+                    response = await client.get(url, headers=headers)
+                    response.raise_for_status()
+                    job_data = orjson.loads(response.content)
+                
                 if status == "completed":
                     print("\n✅ Job completed successfully!")
                     return job_data
@@ -141,8 +189,8 @@ def poll_job_status(job_id, token, max_wait_minutes=10):
             print(f"\n❌ Error polling job: {str(e)}")
             return None
             
-        # Wait before next poll
-        time.sleep(5)
+        # Wait before next poll, with jitter
+        interval = await backoff_sleep(interval, POLL_MAX_INTERVAL, POLL_BACKOFF)
 
 
 def display_results(job_data):
@@ -160,62 +208,69 @@ def display_results(job_data):
         print(f"   Completed: {job_data['completed_at']}")
     
     # Results
-    if job_data.get('result'):
-        result = job_data['result']
+    result = job_data.get('result')
+    if result:
         
         # Display book summary if available
-        if result.get('book_key'):
+        book_key = result.get('book_key')
+        if book_key:
             print(f"\n📖 Book Summary:")
-            print(f"   Book Key: {result.get('book_key')}")
+            print(f"   Book Key: {book_key}")
             print(f"   Total Pages: {result.get('total_pages', 'N/A')}")
             print(f"   Completed Pages: {result.get('completed_pages', 'N/A')}")
             print(f"   Average Confidence: {result.get('average_final_confidence', 'N/A')}")
         
         # Display individual page results if available
-        if result.get('pages'):
-            print(f"\n📄 Page Results ({len(result['pages'])} pages):")
-            for page in result['pages'][:5]:  # Show first 5 pages
+        pages = result.get('pages')
+        if pages:
+            print(f"\n📄 Page Results ({len(pages)} pages):")
+            for page in pages[:5]:  # Show first 5 pages
                 print(f"\n   Page {page.get('page_number', 'N/A')}:")
                 print(f"   - File: {page.get('file_name', 'N/A')}")
                 print(f"   - Confidence: {page.get('confidence', 'N/A')}")
-                if page.get('transcription'):
-                    preview = page['transcription'][:100] + "..." if len(page['transcription']) > 100 else page['transcription']
+                transcription = page.get('transcription')
+                if transcription:
+                    preview = transcription[:100] + "..." if len(transcription) > 100 else transcription
                     print(f"   - Text Preview: {preview}")
             
-            if len(result['pages']) > 5:
-                print(f"\n   ... and {len(result['pages']) - 5} more pages")
+            if len(pages) > 5:
+                print(f"\n   ... and {len(pages) - 5} more pages")
     
     # Events
-    if job_data.get('events'):
-        print(f"\n📝 Processing Events ({len(job_data['events'])} total):")
-        for event in job_data['events'][-5:]:  # Show last 5 events
+    events = job_data.get('events')
+    if events:
+        print(f"\n📝 Processing Events ({len(events)} total):")
+        for event in events[-5:]:  # Show last 5 events
             print(f"   - [{event['timestamp']}] {event['message']}")
 
 
-def main():
+async def main():
     """Main test function."""
     print("🚀 Book Ingestion Crew Test")
     print("="*60)
     
-    # Generate token
-    token = generate_test_token()
-    print(f"Generated test token: {token[:20]}...")
-    
-    # Test API connection
-    if not test_api_connection(token):
-        print("\n⚠️  Please make sure the API is running:")
-        print("   .venv/bin/python services/crew-api/main.py")
-        return
-    
-    # Create job
-    job_id = create_book_ingestion_job(token)
-    if not job_id:
-        return
-    
-    # Poll for results
-    job_data = poll_job_status(job_id, token)
-    if not job_data:
-        return
+    # One client for the whole run so polls reuse the same connection
+    async with make_client() as client:
+        # Open the connection with the health check while the token is generated
+        health_check = asyncio.create_task(test_api_connection(client))
+        token = await asyncio.to_thread(generate_test_token)
+        print(f"Generated test token: {token[:20]}...")
+        
+        # Test API connection
+        if not await health_check:
+            print("\n⚠️  Please make sure the API is running:")
+            print("   .venv/bin/python services/crew-api/main.py")
+            return
+        
+        # Create job
+        job_id = await create_book_ingestion_job(client, token)
+        if not job_id:
+            return
+        
+        # Poll for results
+        job_data = await poll_job_status(client, job_id, token)
+        if not job_data:
+            return
     
     # Display results
     display_results(job_data)
@@ -224,4 +279,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -4,14 +4,22 @@ Standalone test for book ingestion crew.
 This bypasses the complex import structure and runs the crew directly.
 """
 
+import functools
 import os
 import sys
 import json
+import orjson
 import yaml
 from pathlib import Path
 from dotenv import load_dotenv
 from crewai import Agent, Crew, Process, Task
 
+# libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Load environment variables
 load_dotenv()
 
@@ -25,12 +33,36 @@ from sparkjar_shared.tools.image_viewer_tool import ImageViewerTool
 from sparkjar_shared.tools.memory.sj_sequential_thinking_tool import SJSequentialThinkingTool
 from sparkjar_shared.tools.database.database_storage_tool import DatabaseStorageTool
 
+@functools.lru_cache(maxsize=None)
+def _load_yaml(path, mtime):
+    """Load a YAML config, from its JSON sidecar when that is not older than the YAML."""
+    sidecar = Path(path + ".json")
+    try:
+        if sidecar.stat().st_mtime >= mtime:
+            return orjson.loads(sidecar.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    
+    with open(path, "r") as f:
+        config = yaml.load(f, Loader=YamlLoader)
+    
+    # Later runs read the sidecar and skip the YAML parser entirely
+    try:
+        sidecar.write_bytes(orjson.dumps(config))
+    except (OSError, TypeError):
+        pass
+    return config
+
+
+def load_yaml(path):
+    """Load a YAML config, reusing the parse while the file is unchanged."""
+    return _load_yaml(str(path), os.path.getmtime(path))
+
+
 # Load configurations
 config_dir = Path("services/crew-api/src/crews/book_ingestion_crew/config")
-with open(config_dir / "agents_enhanced.yaml", "r") as f:
-    agents_cfg = yaml.safe_load(f)
-with open(config_dir / "tasks_enhanced.yaml", "r") as f:
-    tasks_cfg = yaml.safe_load(f)
+agents_cfg = load_yaml(config_dir / "agents_enhanced.yaml")
+tasks_cfg = load_yaml(config_dir / "tasks_enhanced.yaml")
 
 # Load request data
 with open('book_ingestion_request.json', 'r') as f:
@@ -4,6 +4,7 @@
 import os
 import sys
 import json
+from contextlib import contextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -27,43 +28,55 @@ print(f"Google Drive Path: {folder_path}")
 
 # Direct database query to get credentials
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from uuid import UUID
 
 database_url = os.getenv('DATABASE_URL_DIRECT')
 if database_url:
     database_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
 
+# Both checks borrow from one pool, so the second reuses the first's connection
+_POOL = None
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a connection from the shared pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadedConnectionPool(minconn=1, maxconn=4, dsn=database_url)
+    conn = _POOL.getconn()
+    try:
+        yield conn
+    finally:
+        _POOL.putconn(conn)
+
+
 try:
     print("\n📊 Checking Google credentials...")
-    conn = psycopg2.connect(database_url)
-    cur = conn.cursor()
-    
-    # Get client_id from user_id
-    cur.execute("""
-        SELECT clients_id FROM client_users WHERE id = %s
-    """, (client_user_id,))
-    
-    result = cur.fetchone()
-    if result:
-        client_id = result[0]
-        print(f"✅ Found client_id: {client_id}")
-        
-        # Check for Google credentials
+    with pooled_connection() as conn, conn.cursor() as cur:
+        # Resolve the user's client and its Google credentials in one round-trip;
+        # the LEFT JOIN still reports the client when it has no credentials
         cur.execute("""
-            SELECT secret_key, 
-                   CASE WHEN secrets_metadata IS NOT NULL THEN 'HAS CREDENTIALS' ELSE 'NO CREDENTIALS' END
-            FROM client_secrets 
-            WHERE client_id = %s AND secret_key = 'googleapis.service_account'
-        """, (client_id,))
+            SELECT cu.clients_id,
+                   CASE WHEN cs.secrets_metadata IS NOT NULL THEN 'HAS CREDENTIALS' ELSE 'NO CREDENTIALS' END,
+                   cs.secret_key IS NOT NULL
+            FROM client_users cu
+            LEFT JOIN client_secrets cs
+                   ON cs.client_id = cu.clients_id
+                  AND cs.secret_key = 'googleapis.service_account'
+            WHERE cu.id = %s
+        """, (client_user_id,))
         
-        cred_result = cur.fetchone()
-        if cred_result:
-            print(f"✅ Google credentials: {cred_result[1]}")
-        else:
-            print("❌ No Google credentials found")
-    
-    cur.close()
-    conn.close()
+        result = cur.fetchone()
+        if result:
+            client_id, cred_status, has_secret = result
+            print(f"✅ Found client_id: {client_id}")
+            
+            if has_secret:
+                print(f"✅ Google credentials: {cred_status}")
+            else:
+                print("❌ No Google credentials found")
     
 except Exception as e:
     print(f"❌ Database error: {e}")
@@ -75,17 +88,16 @@ try:
     from googleapiclient.discovery import build
     
     # Get credentials from database
-    conn = psycopg2.connect(database_url)
-    cur = conn.cursor()
-    
-    cur.execute("""
-        SELECT cs.secrets_metadata
-        FROM client_secrets cs
-        JOIN client_users cu ON cu.clients_id = cs.client_id
-        WHERE cu.id = %s AND cs.secret_key = 'googleapis.service_account'
-    """, (client_user_id,))
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT cs.secrets_metadata
+            FROM client_secrets cs
+            JOIN client_users cu ON cu.clients_id = cs.client_id
+            WHERE cu.id = %s AND cs.secret_key = 'googleapis.service_account'
+        """, (client_user_id,))
+        
+        result = cur.fetchone()
     
-    result = cur.fetchone()
     if result and result[0]:
         creds_data = result[0]
         print("✅ Retrieved Google credentials from database")
@@ -117,13 +129,13 @@ try:
     else:
         print("❌ No Google credentials in database")
     
-    cur.close()
-    conn.close()
-    
 except ImportError as e:
     print(f"❌ Missing dependency: {e}")
     print("   Install with: pip install google-api-python-client google-auth")
 except Exception as e:
     print(f"❌ Error: {e}")
     import traceback
-    traceback.print_exc()
\ No newline at end of file
+    traceback.print_exc()
+finally:
+    if _POOL is not None:
+        _POOL.closeall()
@@ -4,7 +4,6 @@
 import os
 import sys
 import json
-import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import psycopg2
@@ -125,16 +124,16 @@ try:
         file_id = files[0]['id']
         request = service.files().get_media(fileId=file_id)
         
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            downloader = MediaIoBaseDownload(tmp_file, request)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                if status:
-                    print(f"   Download {int(status.progress() * 100)}%")
-            
-            tmp_path = tmp_file.name
-            print(f"✅ Downloaded to: {tmp_path}")
+        # Download straight into memory; the image is only needed for encoding
+        buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(buffer, request)
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+            if status:
+                print(f"   Download {int(status.progress() * 100)}%")
+        
+        print(f"✅ Downloaded {buffer.getbuffer().nbytes} bytes")
         
         # Test OCR with OpenAI
         print("\n🔍 Testing OCR with GPT-4o...")
@@ -143,9 +142,9 @@ try:
         
         openai.api_key = os.getenv('OPENAI_API_KEY')
         
-        # Read and encode image
-        with open(tmp_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
+        # Encode image; base64 output is pure ASCII
+        image_data = base64.b64encode(buffer.getbuffer()).decode('ascii')
+        buffer.close()
         
         # Create OCR request
         response = openai.chat.completions.create(
@@ -175,8 +174,6 @@ try:
         print(transcription)
         print("-" * 50)
         
-        # Clean up
-        os.unlink(tmp_path)
         print("\n✅ Test completed successfully!")
         
 except Exception as e:
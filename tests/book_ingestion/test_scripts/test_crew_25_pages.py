@@ -9,7 +9,27 @@ logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 # Test with the simple crew implementation
 from crews.book_ingestion_crew.crew_simple import build_simple_crew, list_files
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Pages are independent, so several run at once; OpenAI rate limits cap this
+MAX_PAGE_WORKERS = 8
+MAX_RATE_LIMIT_RETRIES = 3
+
+def process_page(page_input):
+    """Run one page through its own crew, backing off on rate limits."""
+    # A crew carries per-run state, so each page gets its own
+    crew = build_simple_crew()
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        try:
+            return crew.kickoff(inputs=page_input)
+        except Exception as e:
+            message = str(e).lower()
+            rate_limited = "429" in message or "rate limit" in message
+            if not rate_limited or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            time.sleep(2 ** attempt + random.uniform(0, 1))
 
 def test_crew_25_pages():
     """Test the crew with 25 pages."""
@@ -30,10 +50,6 @@ def test_crew_25_pages():
     files = list_files(inputs)
     print(f"Found {len(files)} files")
     
-    # Build the crew
-    print("\n🤖 Building crew...")
-    crew = build_simple_crew()
-    
     # Prepare inputs for first 5 pages as a test
     page_inputs = []
     for i, file_info in enumerate(files[:5]):
@@ -51,9 +67,11 @@ def test_crew_25_pages():
     print(f"\n📄 Processing {len(page_inputs)} pages with crew...")
     start_time = time.time()
     
-    # Process with kickoff_for_each
+    # Process pages in parallel, one crew per page; results keep page order
     try:
-        results = crew.kickoff_for_each(inputs=page_inputs)
+        print(f"\n🤖 Running up to {MAX_PAGE_WORKERS} crews in parallel...")
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            results = list(executor.map(process_page, page_inputs))
         
         # Check results
         successful = 0
@@ -0,0 +1,210 @@
+"""
+Unit tests for the Memory Service client caches.
+
+KISS: Fake the HTTP transport, check what reaches the memory service.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import orjson
+import pytest
+from cachetools import TTLCache
+
+from src.chat.clients.memory_service import MemoryServiceClient
+
+
+def make_response(payload):
+    """Build a fake httpx response carrying a JSON payload."""
+    response = MagicMock()
+    response.content = orjson.dumps(payload)
+    return response
+
+
+class TestMemoryServiceClientCache:
+    """Test search caching and write invalidation."""
+
+    @pytest.fixture
+    def http(self):
+        """Create a fake pooled HTTP client that returns no memories."""
+        http = MagicMock()
+        http.is_closed = False
+        http.request = AsyncMock(return_value=make_response([]))
+        return http
+
+    @pytest.fixture
+    def client(self, http):
+        """Create a memory client wired to the fake HTTP client."""
+        client = MemoryServiceClient(base_url="http://memory.test")
+        client._client = http
+        return client
+
+    @pytest.fixture
+    def synth_context(self):
+        """Create a SYNTH context for one client."""
+        return SimpleNamespace(
+            client_id=uuid4(),
+            synth_id=uuid4(),
+            memory_access_scope=[]
+        )
+
+    def search_calls(self, http):
+        """Count requests that hit the search endpoint."""
+        return sum(
+            1 for call in http.request.call_args_list
+            if call.kwargs["url"].endswith("/memory/search")
+        )
+
+    async def test_repeat_search_hits_cache(self, client, http, synth_context):
+        """Test that an identical search is served from the cache."""
+        await client.search_relevant_memories("indexes", synth_context)
+        await client.search_relevant_memories("indexes", synth_context)
+
+        assert self.search_calls(http) == 1
+
+    async def test_cached_search_expires(self, client, http, synth_context):
+        """Test that searches are repeated once the TTL has passed."""
+        now = [0.0]
+        client._search_cache = TTLCache(maxsize=16, ttl=60, timer=lambda: now[0])
+
+        await client.search_relevant_memories("indexes", synth_context)
+        now[0] = 61.0
+        await client.search_relevant_memories("indexes", synth_context)
+
+        assert self.search_calls(http) == 2
+
+    async def test_write_invalidates_own_searches(self, client, http, synth_context):
+        """Test that a SYNTH's write drops its cached searches."""
+        await client.search_relevant_memories("indexes", synth_context)
+
+        await client._make_request(
+            method="POST",
+            endpoint="/memory/entities/complete",
+            json_data={"entity": {}},
+            client_id=synth_context.client_id,
+            actor_type="synth",
+            actor_id=synth_context.synth_id
+        )
+        await client.search_relevant_memories("indexes", synth_context)
+
+        assert self.search_calls(http) == 2
+
+    async def test_write_keeps_other_synths_searches(self, client, http, synth_context):
+        """Test that a SYNTH's write leaves other SYNTHs and tenants cached."""
+        other_synth = SimpleNamespace(
+            client_id=synth_context.client_id,
+            synth_id=uuid4(),
+            memory_access_scope=[]
+        )
+        other_client = SimpleNamespace(
+            client_id=uuid4(),
+            synth_id=synth_context.synth_id,
+            memory_access_scope=[]
+        )
+        for context in (other_synth, other_client):
+            await client.search_relevant_memories("indexes", context)
+
+        await client._make_request(
+            method="POST",
+            endpoint="/memory/entities",
+            json_data=[],
+            client_id=synth_context.client_id,
+            actor_type="synth",
+            actor_id=synth_context.synth_id
+        )
+        for context in (other_synth, other_client):
+            await client.search_relevant_memories("indexes", context)
+
+        assert self.search_calls(http) == 2
+
+    async def test_client_level_write_invalidates_whole_client(self, client, http, synth_context):
+        """Test that a client-level write drops every SYNTH of that client."""
+        await client.search_relevant_memories("indexes", synth_context)
+
+        await client._make_request(
+            method="POST",
+            endpoint="/memory/entities",
+            json_data=[],
+            client_id=synth_context.client_id,
+            actor_type="system",
+            actor_id=synth_context.client_id
+        )
+        await client.search_relevant_memories("indexes", synth_context)
+
+        assert self.search_calls(http) == 2
+
+    async def test_search_does_not_invalidate(self, client, http, synth_context):
+        """Test that read-only POSTs keep the cache warm."""
+        await client.search_relevant_memories("indexes", synth_context)
+        await client.search_relevant_memories("tables", synth_context)
+        await client.search_relevant_memories("indexes", synth_context)
+
+        assert self.search_calls(http) == 2
+
+    async def test_write_during_search_skips_caching(self, client, http, synth_context):
+        """Test that a search overlapping a write doesn't cache its result."""
+        release = asyncio.Event()
+
+        async def slow_search(**kwargs):
+            if kwargs["url"].endswith("/memory/search"):
+                await release.wait()
+            return make_response([])
+
+        http.request.side_effect = slow_search
+        search = asyncio.create_task(
+            client.search_relevant_memories("indexes", synth_context)
+        )
+        await asyncio.sleep(0)
+
+        await client._make_request(
+            method="POST",
+            endpoint="/memory/entities",
+            json_data=[],
+            client_id=synth_context.client_id,
+            actor_type="synth",
+            actor_id=synth_context.synth_id
+        )
+        release.set()
+        await search
+
+        assert len(client._search_cache) == 0
+
+    async def test_stale_search_keeps_newer_inflight(self, client, http, synth_context):
+        """Test that a search finishing after invalidation leaves its successor registered."""
+        releases = []
+
+        async def gated_search(**kwargs):
+            if kwargs["url"].endswith("/memory/search"):
+                release = asyncio.Event()
+                releases.append(release)
+                await release.wait()
+            return make_response([])
+
+        http.request.side_effect = gated_search
+        first = asyncio.create_task(
+            client.search_relevant_memories("indexes", synth_context)
+        )
+        await asyncio.sleep(0)
+        await client._make_request(
+            method="POST",
+            endpoint="/memory/entities",
+            json_data=[],
+            client_id=synth_context.client_id,
+            actor_type="synth",
+            actor_id=synth_context.synth_id
+        )
+        second = asyncio.create_task(
+            client.search_relevant_memories("indexes", synth_context)
+        )
+        await asyncio.sleep(0)
+
+        releases[0].set()
+        await first
+        assert len(client._inflight) == 1
+
+        releases[1].set()
+        await second
+        assert len(client._inflight) == 0
+        assert len(client._search_cache) == 1
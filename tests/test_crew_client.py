@@ -4,10 +4,11 @@ Integration tests for CrewClient
 Tests the HTTP client that communicates with the SparkJAR Crews Service.
 """
 
+import time
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import httpx
-from datetime import datetime, timedelta
 
 from services.crew_client import CrewClient, get_crew_client
 from services.crew_client_exceptions import (
@@ -97,7 +98,7 @@ class TestCrewClient:
         assert mock_get_token.call_count == 1  # No additional calls
         
         # Simulate token expiration
-        client._token_expires = datetime.utcnow() - timedelta(minutes=1)
+        client._token_expires = time.monotonic() - 60
         token3 = client._get_auth_token()
         assert token3 == "test.token.123"
         assert mock_get_token.call_count == 2  # New token generated
@@ -139,7 +140,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock successful response
             mock_response = Mock()
@@ -173,7 +174,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock 404 response
             mock_response = Mock()
@@ -198,7 +199,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock successful HTTP response but failed crew execution
             mock_response = Mock()
@@ -229,7 +230,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock connection error
             mock_client.request.side_effect = httpx.ConnectError("Connection failed")
@@ -250,7 +251,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock timeout error
             mock_client.request.side_effect = httpx.TimeoutException("Request timeout")
@@ -271,7 +272,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock successful response
             mock_response = Mock()
@@ -299,7 +300,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # Mock successful response
             mock_response = Mock()
@@ -324,13 +325,42 @@ class TestCrewClient:
         """Test client cleanup"""
         # Set some cached data
         client._token_cache = "test.token"
-        client._token_expires = datetime.utcnow() + timedelta(hours=1)
+        client._token_expires = time.monotonic() + 3600
+        
+        http_client = AsyncMock()
+        client._http_client = http_client
         
         await client.close()
         
-        # Verify cache is cleared
+        # Verify pooled connections are closed and cache is cleared
+        http_client.aclose.assert_awaited_once()
+        assert client._http_client is None
         assert client._token_cache is None
-        assert client._token_expires is None
+        assert client._token_expires == 0.0
+    
+    @pytest.mark.asyncio
+    @patch('services.crew_client.get_internal_token')
+    async def test_http_client_reused(self, mock_get_token, client):
+        """Test requests share one pooled HTTP client"""
+        mock_get_token.return_value = "test.token"
+        
+        with patch('httpx.AsyncClient') as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.is_closed = False
+            mock_client_class.return_value = mock_client
+            # status_code and text feed the client's request metrics
+            mock_client.request.return_value = Mock(
+                status_code=200,
+                text="",
+                is_success=True,
+                json=lambda: {"status": "healthy"}
+            )
+            
+            await client.health_check()
+            await client.health_check()
+            
+            mock_client_class.assert_called_once()
+            assert mock_client.request.call_count == 2
     
     def test_global_client_singleton(self):
         """Test global client singleton pattern"""
@@ -347,7 +377,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             # First two calls fail, third succeeds
             mock_client.request.side_effect = [
@@ -371,7 +401,7 @@ class TestCrewClient:
         
         with patch('httpx.AsyncClient') as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
             
             mock_response = Mock()
             mock_response.is_success = True
@@ -0,0 +1,110 @@
+"""
+Tests for the JSON schema validation service
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.json_validator import JSONSchemaValidator
+
+
+TEST_SCHEMA = {
+    "id": 1,
+    "name": "test_crew",
+    "object_type": "crew",
+    "description": "Test crew schema",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "job_key": {"type": "string"},
+            "client_user_id": {"type": "string"},
+            "actor_type": {"type": "string"},
+            "actor_id": {"type": "string"},
+            "pages": {"type": "integer"},
+        },
+        "required": ["job_key", "pages"],
+    },
+}
+
+
+def make_payload(**overrides):
+    """Build a valid payload for the test schema."""
+    payload = {
+        "job_key": "test_crew",
+        "client_user_id": "user-1",
+        "actor_type": "synth",
+        "actor_id": "actor-1",
+        "pages": 3,
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.fixture
+def validator():
+    """Validator with the database lookup stubbed out."""
+    validator = JSONSchemaValidator()
+    validator._get_single_schema = AsyncMock(return_value=TEST_SCHEMA)
+    return validator
+
+
+class TestJSONSchemaValidator:
+    """Test cases for JSONSchemaValidator"""
+
+    @pytest.mark.asyncio
+    async def test_valid_request_single_lookup(self, validator):
+        """A job_key lookup should load the schema exactly once"""
+        result = await validator.validate_request_data(make_payload(), db=MagicMock())
+
+        assert result["valid"] is True
+        assert result["schema_used"] == "test_crew"
+        assert not result["errors"]
+        validator._get_single_schema.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_request_reports_errors(self, validator):
+        """Schema and core field errors are combined on failure"""
+        result = await validator.validate_request_data(
+            make_payload(pages="three", actor_id=""), db=MagicMock()
+        )
+
+        assert result["valid"] is False
+        assert result["validated_data"] is None
+        assert "Core field 'actor_id' cannot be empty" in result["errors"]
+        assert any(e.startswith("Schema validation error") for e in result["errors"])
+
+    @pytest.mark.asyncio
+    async def test_validate_many(self, validator):
+        """Batch validation resolves the schema once and reports per item"""
+        payloads = [make_payload(), make_payload(pages="x"), make_payload(pages=7)]
+
+        valid_mask, errors = await validator.validate_many(payloads, db=MagicMock())
+
+        assert valid_mask == [True, False, True]
+        assert errors[0] == [] and errors[2] == []
+        assert len(errors[1]) == 1
+        validator._get_single_schema.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_validate_many_empty(self, validator):
+        """An empty batch never touches the database"""
+        assert await validator.validate_many([], db=MagicMock()) == ([], [])
+        validator._get_single_schema.assert_not_awaited()
+
+    def test_compiled_validator_cached_by_content(self, validator):
+        """Equal schemas share a compiled validator regardless of key order"""
+        schema = TEST_SCHEMA["schema"]
+        reordered = dict(reversed(list(schema.items())))
+
+        assert validator._get_compiled_validator(schema) is validator._get_compiled_validator(reordered)
+
+    @pytest.mark.asyncio
+    async def test_warm_cache_compiles_crew_schemas(self, validator):
+        """Warm-up compiles each valid schema and skips broken ones"""
+        broken = dict(TEST_SCHEMA, name="broken", schema={"type": 12})
+        validator.get_crew_request_schemas = AsyncMock(
+            return_value={"test_crew": TEST_SCHEMA, "broken": broken}
+        )
+
+        assert await validator.warm_cache(db=MagicMock()) == 1
+        assert len(validator._validator_cache) == 1
@@ -0,0 +1,140 @@
+"""
+Tests for incremental re-vectorization in the vectorization service
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from pgvector import Vector
+
+from services import vectorization_service
+from services.vectorization_service import VectorizationService
+
+
+EVENT = {
+    "id": "event-1",
+    "event_type": "agent_action",
+    "created_at": "2025-01-01T00:00:00Z",
+    "event_data": {"message": "Looked up the customer record"},
+}
+
+
+@asynccontextmanager
+async def fake_session():
+    yield MagicMock()
+
+
+@pytest.fixture
+def service():
+    """Service with a fake embedding client and no tokenizer download"""
+    with patch.object(vectorization_service, "EmbeddingClient") as client_class, \
+            patch.object(vectorization_service, "get_direct_session", fake_session), \
+            patch.object(vectorization_service, "load_tokenizer", AsyncMock(return_value=None)):
+        client_class.return_value.model_name = "text-embedding-3-small"
+        service = VectorizationService()
+        service._get_embeddings = AsyncMock(
+            side_effect=lambda texts: np.zeros((len(texts), 4), dtype=np.float32)
+        )
+        service._write_shard = AsyncMock(
+            side_effect=lambda shard, use_copy, write_slots: write_slots.release()
+        )
+        service._reconcile_kept_chunks = AsyncMock()
+        yield service
+
+
+def stored_hashes_for(service, event, model_name=None):
+    """Content hashes as stored after vectorizing event with model_name"""
+    if model_name is not None:
+        service.embedding_client.model_name = model_name
+    hasher = service._content_hasher()
+    _, _, texts = service._chunk_text(service._create_event_text(event))
+    service.embedding_client.model_name = "text-embedding-3-small"
+    return {
+        (str(event["id"]), i): service._content_hash(hasher, chunk_text)
+        for i, chunk_text in enumerate(texts)
+    }
+
+
+@pytest.mark.asyncio
+async def test_unchanged_event_is_skipped(service):
+    service._load_content_hashes = AsyncMock(
+        return_value=stored_hashes_for(service, EVENT)
+    )
+
+    result = await service.vectorize_job_events("job-1", [EVENT])
+
+    assert result["unchanged_chunks"] == 1
+    assert result["total_chunks"] == 0
+    service._get_embeddings.assert_not_called()
+    service._reconcile_kept_chunks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_model_change_re_embeds_unchanged_text(service):
+    service._load_content_hashes = AsyncMock(
+        return_value=stored_hashes_for(service, EVENT, "all-minilm-l6-v2")
+    )
+
+    result = await service.vectorize_job_events("job-1", [EVENT])
+
+    assert result["unchanged_chunks"] == 0
+    assert result["total_chunks"] == 1
+    service._get_embeddings.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_shorter_event_relabels_and_drops_trailing_chunks(service):
+    stored = stored_hashes_for(service, EVENT)
+    stored[("event-1", 1)] = b"old second chunk"
+    stored[("event-1", 2)] = b"old third chunk"
+    service._load_content_hashes = AsyncMock(return_value=stored)
+
+    result = await service.vectorize_job_events("job-2", [EVENT])
+
+    assert result["unchanged_chunks"] == 1
+    trailing, relabels = service._reconcile_kept_chunks.await_args.args
+    assert trailing == [("event-1", 1)]
+    assert [(source_id, index) for source_id, index, _ in relabels] == [("event-1", 0)]
+    assert '"total_chunks":1' in relabels[0][2]
+    assert '"job_id":"job-2"' in relabels[0][2]
+
+
+def upsert_records():
+    """Two buffered chunk records and their embeddings"""
+    embeddings = np.arange(8, dtype=np.float32).reshape(2, 4)
+    records = [
+        ("crew_job_event", "event-1", "event_data", i, "text", embeddings[i], "{}", b"hash")
+        for i in range(2)
+    ]
+    return records, embeddings
+
+
+@pytest.mark.asyncio
+async def test_upsert_binds_each_embedding_as_one_vector(service):
+    driver_connection = MagicMock(execute=AsyncMock())
+    service._driver_connection = AsyncMock(return_value=(driver_connection, True))
+    records, embeddings = upsert_records()
+
+    await service._write_records(MagicMock(), records, use_copy=False)
+
+    # $6 is the vector[] column; each element must encode as a single vector
+    sql, *params = driver_connection.execute.await_args.args
+    assert "$6::vector[]" in sql
+    assert all(isinstance(vector, Vector) for vector in params[5])
+    assert np.array_equal(np.stack([vector.to_numpy() for vector in params[5]]), embeddings)
+
+
+@pytest.mark.asyncio
+async def test_missing_codec_sends_text_vectors_instead_of_copy(service):
+    driver_connection = MagicMock(execute=AsyncMock(), copy_records_to_table=AsyncMock())
+    service._driver_connection = AsyncMock(return_value=(driver_connection, False))
+    records, _ = upsert_records()
+
+    await service._write_records(MagicMock(), records, use_copy=True)
+
+    driver_connection.copy_records_to_table.assert_not_called()
+    sql, *params = driver_connection.execute.await_args.args
+    assert "$6::text[]::vector[]" in sql
+    assert params[5] == ["[0.0,1.0,2.0,3.0]", "[4.0,5.0,6.0,7.0]"]